@@ -7,72 +7,307 @@ Original: Created by Codex on 2025-07-21
 """
 
 import os
+import array
+import itertools
 import logging
+import logging.handlers
+import queue
+import random
+import socket
 import time
 import threading
-from typing import Any, Dict
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
 
 import redis
+from redis.utils import HIREDIS_AVAILABLE
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, preferring orjson's native encoder."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
 
 REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
+# Set when the broker is co-located to skip the TCP/loopback stack entirely
+REDIS_UNIX_SOCKET = os.environ.get("REDIS_UNIX_SOCKET")
 STREAM_NAME = "a2a_stream"
 RESULT_STREAM = "a2a_stream_results"
 GROUP_NAME = "ai_group"
 CONSUMER_NAME = "ai_connector"
+# Fixed leading arguments of every XACK issued by this consumer
+ACK_ARGS = (STREAM_NAME, GROUP_NAME)
 HEALTH_PORT = int(os.environ.get("HEALTH_PORT", 8080))
+BATCH_SIZE = int(os.environ.get("AI_CONNECTOR_BATCH_SIZE", 64))
+# NOACK reads skip the pending-entries list and the XACK round-trip, at the
+# cost of at-most-once delivery: a crash loses in-flight tasks.
+USE_NOACK = os.environ.get("AI_CONNECTOR_NOACK", "").lower() in ("1", "true", "yes")
+# Approximate cap on the result stream length (0 disables trimming)
+RESULT_STREAM_MAXLEN = int(os.environ.get("AI_CONNECTOR_RESULT_MAXLEN", 100_000))
+# Processed batches waiting for the writer; a full queue pauses the reader.
+RESULT_QUEUE_SIZE = int(os.environ.get("AI_CONNECTOR_RESULT_QUEUE_SIZE", 1024))
+# Idle consumers wake once per block period; long blocks mean fewer wakeups.
+XREAD_BLOCK_MS = int(os.environ.get("AI_CONNECTOR_BLOCK_MS", 30000))
+RECONNECT_BACKOFF_MIN = 0.1
+RECONNECT_BACKOFF_MAX = 5.0
+# Must outlive a blocking XREADGROUP, or idle reads would time out.
+SOCKET_TIMEOUT = XREAD_BLOCK_MS / 1000 + 10.0
+# Pending messages idle this long were delivered but never acknowledged (a
+# failed flush, or a consumer that died); they are claimed and processed
+# again at startup and then every PENDING_RECLAIM_INTERVAL seconds.
+PENDING_RECLAIM_IDLE_MS = int(os.environ.get("AI_CONNECTOR_RECLAIM_IDLE_MS", 60000))
+PENDING_RECLAIM_INTERVAL = 30.0
+# Log one in every N processed tasks at INFO level.
+LOG_SAMPLE_EVERY = max(1, int(os.environ.get("AI_CONNECTOR_LOG_SAMPLE_EVERY", 1024)))
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [AI-Connector] %(message)s",
-)
+_task_counter = itertools.count()
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue so callers only enqueue them.
+
+    Formatting and the stream write happen on the listener's own thread,
+    off the consumer's per-message path.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s [AI-Connector] %(message)s")
+    )
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
-# Global health status
-health_status = {
-    "status": "starting",
-    "redis_connected": False,
-    "last_task_time": None,
-    "tasks_processed": 0,
-    "errors": 0,
-    "uptime_seconds": 0
-}
 start_time = time.time()
 
 
+@dataclass
+class ConsumerStats:
+    """Counters owned by a single worker thread; only it mutates them."""
+    tasks_processed: int = 0
+    errors: int = 0
+    last_task_time: float = 0.0
+    redis_connected: bool = False
+
+
+# Published health snapshot, one row per worker thread (reader, writer):
+# tasks_processed, errors, last_task_time (ms), redis_connected. Each worker
+# overwrites only its own row once per batch; the health handler only reads
+# it. The lock keeps a row from being read half-written; it is held just for
+# the copy, never while serializing.
+READER, WRITER = 0, 1
+_SNAPSHOT_FIELDS = 4
+_SNAPSHOT = array.array("q", [0] * (2 * _SNAPSHOT_FIELDS))
+_snapshot_lock = threading.Lock()
+
+
+def publish_stats(stats: ConsumerStats, row: int = READER) -> None:
+    base = row * _SNAPSHOT_FIELDS
+    values = (
+        stats.tasks_processed,
+        stats.errors,
+        int(stats.last_task_time * 1000),
+        stats.redis_connected,
+    )
+    with _snapshot_lock:
+        _SNAPSHOT[base:base + _SNAPSHOT_FIELDS] = array.array("q", values)
+
+
+def read_stats() -> List[int]:
+    with _snapshot_lock:
+        return _SNAPSHOT.tolist()
+
+
+HEALTH_REQUEST_LINE = b"GET /health "
+# A probe's request line fits comfortably; longer lines take the slow path
+PROBE_LINE_LIMIT = 256
+MAX_PROBE_HEADERS = 100
+HEALTH_RESPONSE_HEAD = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n"
+)
+NOT_FOUND_RESPONSE = b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n"
+# Idle keep-alive connections are dropped after this many seconds
+HEALTH_IDLE_TIMEOUT = 30
+
+
+def build_health_response(now: float) -> bytes:
+    (read_tasks, read_errors, read_last_ms, redis_connected,
+     written_tasks, write_errors, write_last_ms, _) = read_stats()
+    last_task_ms = max(read_last_ms, write_last_ms)
+    health_status = {
+        "status": "healthy" if redis_connected else "unhealthy",
+        "redis_connected": bool(redis_connected),
+        "last_task_time": last_task_ms / 1000 if last_task_ms else None,
+        "tasks_processed": read_tasks + written_tasks,
+        "errors": read_errors + write_errors,
+        "uptime_seconds": int(now - start_time),
+    }
+    body = dumps(health_status)
+    return HEALTH_RESPONSE_HEAD % len(body) + body
+
+
+# Serialized /health response and when it was built, rebuilt at most once
+# per second. Stored as one tuple so connection threads never see a
+# timestamp paired with the wrong body.
+HEALTH_CACHE_SECONDS = 1.0
+_cached_health = (0.0, b"")
+
+
+def get_health_response() -> bytes:
+    global _cached_health
+    now = time.time()
+    built_at, response = _cached_health
+    if now - built_at > HEALTH_CACHE_SECONDS:
+        response = build_health_response(now)
+        _cached_health = (now, response)
+    return response
+
+
 class HealthHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        if self.path == '/health':
-            health_status["uptime_seconds"] = int(time.time() - start_time)
-            
-            # Determine overall status
-            if health_status["redis_connected"]:
-                health_status["status"] = "healthy"
-            else:
-                health_status["status"] = "unhealthy"
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(health_status).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
-    
+    # HTTP/1.1 keeps probe connections open between requests
+    protocol_version = "HTTP/1.1"
+    timeout = HEALTH_IDLE_TIMEOUT
+
+    def handle_one_request(self):
+        # Probes are answered from the request line alone, skipping header
+        # parsing and the send_response/send_header machinery.
+        try:
+            line = self.rfile.readline(PROBE_LINE_LIMIT)
+        except TimeoutError:
+            self.close_connection = True
+            return
+        if line.startswith(HEALTH_REQUEST_LINE):
+            self.skip_headers()
+            self.wfile.write(get_health_response())
+            self.close_connection = False
+            return
+
+        # Anything else gets the regular parser (and a 404)
+        if line and not line.endswith(b"\n"):
+            line += self.rfile.readline(65537 - len(line))
+        self.raw_requestline = line
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.send_error(414)
+            return
+        if not self.parse_request():
+            return
+        self.wfile.write(NOT_FOUND_RESPONSE)
+
+    def skip_headers(self):
+        """Consume the probe's headers without building a message object.
+
+        Leaving them unread would make closing the socket send a RST,
+        which some probes report as a failure.
+        """
+        for _ in range(MAX_PROBE_HEADERS):
+            if self.rfile.readline(65537) in (b"\r\n", b"\n", b""):
+                return
+
     def log_message(self, format, *args):
         # Suppress default HTTP server logging
         pass
 
 
 def run_health_server():
-    server = HTTPServer(('0.0.0.0', HEALTH_PORT), HealthHandler)
+    # One thread per connection, not per probe: keep-alive clients reuse it,
+    # and an idle one can't stall the others.
+    server = ThreadingHTTPServer(('0.0.0.0', HEALTH_PORT), HealthHandler)
     logging.info(f"Health endpoint listening on port {HEALTH_PORT}")
     server.serve_forever()
 
 
+def keepalive_options() -> Dict[int, int]:
+    """Detect a dead broker in ~1 minute instead of the OS default of hours."""
+    options = {}
+    for name, value in (
+        ("TCP_KEEPIDLE", 30),
+        ("TCP_KEEPINTVL", 10),
+        ("TCP_KEEPCNT", 3),
+    ):
+        # Not every platform exposes all three (e.g. macOS lacks TCP_KEEPIDLE)
+        if hasattr(socket, name):
+            options[getattr(socket, name)] = value
+    return options
+
+
+def create_pool() -> redis.ConnectionPool:
+    """Build the process-wide pool, over a Unix socket when one is configured.
+
+    redis-py already sets TCP_NODELAY on every TCP connection it opens.
+    """
+    common = dict(
+        max_connections=16,
+        socket_timeout=SOCKET_TIMEOUT,
+        socket_connect_timeout=5.0,
+        health_check_interval=30,
+    )
+    if REDIS_UNIX_SOCKET:
+        return redis.ConnectionPool(
+            connection_class=redis.UnixDomainSocketConnection,
+            path=REDIS_UNIX_SOCKET,
+            **common,
+        )
+    return redis.ConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        socket_keepalive=True,
+        socket_keepalive_options=keepalive_options(),
+        **common,
+    )
+
+
+# One pool for the whole process; reconnects reuse it instead of rebuilding
+# the client, and any future producer thread can share it.
+POOL = create_pool()
+
+
 def get_client() -> redis.Redis:
-    return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+    return redis.Redis(connection_pool=POOL)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so a broker restart isn't stampeded."""
+    delay = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_MIN * 2 ** attempt)
+    return delay * (0.5 + random.random())
+
+
+def wait_for_redis(client: redis.Redis, stats: ConsumerStats) -> None:
+    """Block until Redis answers a PING and the consumer group exists."""
+    attempt = 0
+    while True:
+        try:
+            client.ping()
+            ensure_group(client)
+            stats.redis_connected = True
+            publish_stats(stats)
+            return
+        except (redis.ConnectionError, redis.TimeoutError):
+            logging.info("Redis connection failed, retrying...")
+            stats.redis_connected = False
+            stats.errors += 1
+            publish_stats(stats)
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
 
 
 def ensure_group(client: redis.Redis) -> None:
@@ -86,76 +321,226 @@ def ensure_group(client: redis.Redis) -> None:
             raise
 
 
-def process_task(
-    entry: Dict[str, Any],
+def process_task(entry: Dict[bytes, bytes]) -> Dict[bytes, Any]:
+    # Payloads stay as raw RESP bytes: the task is echoed back untouched, so
+    # only the (sampled) log line ever pays for a UTF-8 decode.
+    task = entry.get(b"task")
+    if next(_task_counter) % LOG_SAMPLE_EVERY == 0:
+        shown = task.decode("utf-8", "replace") if task is not None else None
+        logging.info(f"Processing task: {shown}")
+    return {b"status": b"completed", b"result": task}
+
+
+def flush_results(
     client: redis.Redis,
-    message_id: str,
+    results: List[Tuple[bytes, Dict[bytes, Any]]],
 ) -> None:
-    task = entry.get("task")
-    logging.info(f"Processing task: {task}")
-    result = {"status": "completed", "result": task}
-    client.xack(STREAM_NAME, GROUP_NAME, message_id)
-    client.xadd(RESULT_STREAM, result)
-    
+    """Publish a batch of results and acknowledge it in one round-trip.
+
+    Results are written before the XACK so a failure part-way through
+    leaves the messages pending; reclaim_pending() delivers them again
+    (at-least-once).
+    """
+    pipe = client.pipeline(transaction=False)
+    xadd = pipe.xadd
+    maxlen = RESULT_STREAM_MAXLEN or None
+    message_ids = []
+    for message_id, result in results:
+        xadd(RESULT_STREAM, result, maxlen=maxlen, approximate=True)
+        message_ids.append(message_id)
+    if not USE_NOACK:
+        # XACK takes any number of IDs: one command acknowledges the batch
+        pipe.xack(*ACK_ARGS, *message_ids)
+    pipe.execute()
+
+
+def flush_results_individually(
+    client: redis.Redis,
+    results: List[Tuple[bytes, Dict[bytes, Any]]],
+    stats: ConsumerStats,
+) -> int:
+    """Fallback for a failed batch flush: retry each message on its own.
+
+    Returns the number of messages that were published and acknowledged.
+    """
+    flushed = 0
+    for message_id, result in results:
+        try:
+            client.xadd(
+                RESULT_STREAM,
+                result,
+                maxlen=RESULT_STREAM_MAXLEN or None,
+                approximate=True,
+            )
+            if not USE_NOACK:
+                client.xack(*ACK_ARGS, message_id)
+            flushed += 1
+        except redis.RedisError as e:
+            logging.error(f"Error flushing result for {message_id}: {e}")
+            stats.errors += 1
+    return flushed
+
+
+def reclaim_pending(client: redis.Redis) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+    """Claim the group's long-idle pending messages for this consumer.
+
+    Pages through the pending-entries list with XAUTOCLAIM. Entries whose
+    message was deleted from the stream come back without fields and are
+    dropped.
+    """
+    messages = []
+    start_id = "0-0"
+    while True:
+        reply = client.xautoclaim(
+            STREAM_NAME,
+            GROUP_NAME,
+            CONSUMER_NAME,
+            PENDING_RECLAIM_IDLE_MS,
+            start_id=start_id,
+            count=BATCH_SIZE,
+        )
+        start_id, claimed = reply[0], reply[1]
+        messages.extend(message for message in claimed if message[1] is not None)
+        if start_id in (b"0-0", "0-0"):
+            return messages
+
+
+def process_messages(
+    messages: List[Tuple[bytes, Dict[bytes, bytes]]],
+    stats: ConsumerStats,
+) -> List[Tuple[bytes, Dict[bytes, Any]]]:
+    results = []
+    append = results.append
+    for message_id, entry in messages:
+        try:
+            append((message_id, process_task(entry)))
+        except Exception as e:
+            logging.error(f"Error processing task: {e}")
+            stats.errors += 1
+    return results
+
+
+def drain_batches(result_queue: queue.Queue) -> List[Tuple[float, list]]:
+    """Wait for one processed batch, then take whatever else is queued."""
+    batches = [result_queue.get()]
+    while True:
+        try:
+            batches.append(result_queue.get_nowait())
+        except queue.Empty:
+            return batches
+
+
+def write_batches(
+    client: redis.Redis,
+    batches: List[Tuple[float, list]],
+    stats: ConsumerStats,
+) -> None:
+    results = [item for _batch_ts, batch in batches for item in batch]
+    try:
+        flush_results(client, results)
+        flushed = len(results)
+    except redis.RedisError as e:
+        logging.error(f"Batch flush failed ({e}), retrying per message")
+        stats.errors += 1
+        flushed = flush_results_individually(client, results, stats)
+
     # Update health metrics
-    health_status["tasks_processed"] += 1
-    health_status["last_task_time"] = time.time()
+    stats.tasks_processed += flushed
+    if flushed:
+        stats.last_task_time = batches[-1][0]
+    publish_stats(stats, WRITER)
+
+
+def run_result_writer(client: redis.Redis, result_queue: queue.Queue) -> None:
+    """Flush results on a separate thread so the next read isn't held up.
+
+    Everything queued since the last flush goes out as one pipeline.
+    """
+    stats = ConsumerStats(redis_connected=True)
+    while True:
+        write_batches(client, drain_batches(result_queue), stats)
 
 
 def main() -> None:
+    setup_logging()
+
     # Start health endpoint in separate thread
     health_thread = threading.Thread(target=run_health_server, daemon=True)
     health_thread.start()
     
-    client = None
-    while client is None:
-        try:
-            client = get_client()
-            ensure_group(client)
-            logging.info(f"Connected to Redis {REDIS_HOST}:{REDIS_PORT}")
-            health_status["redis_connected"] = True
-        except redis.ConnectionError:
-            logging.info("Redis connection failed, retrying...")
-            health_status["redis_connected"] = False
-            health_status["errors"] += 1
-            time.sleep(1)
+    stats = ConsumerStats()
+    client = get_client()
+    wait_for_redis(client, stats)
+    redis_target = REDIS_UNIX_SOCKET or f"{REDIS_HOST}:{REDIS_PORT}"
+    logging.info(
+        f"Connected to Redis {redis_target} "
+        f"(parser: {'hiredis' if HIREDIS_AVAILABLE else 'python'})"
+    )
+    if USE_NOACK:
+        logging.info("NOACK mode: tasks are not tracked as pending")
+
+    result_queue = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+    writer_thread = threading.Thread(
+        target=run_result_writer, args=(client, result_queue), daemon=True
+    )
+    writer_thread.start()
+
+    # Bind hot-loop lookups once; the streams dict is reused, not rebuilt
+    xreadgroup = client.xreadgroup
+    enqueue = result_queue.put
+    clock = time.time
+    streams = {STREAM_NAME: ">"}
+    # Without NOACK, unacknowledged messages are reclaimed; the first time
+    # right away, picking up what a previous run left pending
+    next_reclaim = 0.0 if not USE_NOACK else float("inf")
 
     while True:
         try:
-            resp = client.xreadgroup(
+            if clock() >= next_reclaim:
+                next_reclaim = clock() + PENDING_RECLAIM_INTERVAL
+                try:
+                    reclaimed = reclaim_pending(client)
+                except redis.ResponseError as e:
+                    # XAUTOCLAIM needs Redis 6.2
+                    logging.error(f"Cannot reclaim pending tasks: {e}")
+                    next_reclaim = float("inf")
+                    reclaimed = []
+                if reclaimed:
+                    logging.info(f"Reclaimed {len(reclaimed)} pending tasks")
+                    results = process_messages(reclaimed, stats)
+                    if results:
+                        enqueue((clock(), results))
+            resp = xreadgroup(
                 GROUP_NAME,
                 CONSUMER_NAME,
-                {STREAM_NAME: ">"},
-                count=1,
-                block=5000,
+                streams,
+                count=BATCH_SIZE,
+                block=XREAD_BLOCK_MS,
+                noack=USE_NOACK,
             )
-        except redis.ConnectionError:
+        except (redis.ConnectionError, redis.TimeoutError):
             logging.info("Lost Redis connection, retrying...")
-            health_status["redis_connected"] = False
-            health_status["errors"] += 1
-            time.sleep(1)
-            client = None
-            while client is None:
-                try:
-                    client = get_client()
-                    ensure_group(client)
-                    health_status["redis_connected"] = True
-                except redis.ConnectionError:
-                    logging.info("Redis reconnect failed, retrying...")
-                    time.sleep(1)
+            stats.redis_connected = False
+            stats.errors += 1
+            publish_stats(stats)
+            time.sleep(backoff_delay(0))
+            # The pool reopens sockets on demand; keep the same client.
+            wait_for_redis(client, stats)
             continue
 
         if not resp:
             continue
 
+        # One clock read per batch rather than per task
+        batch_ts = clock()
+        results = []
         for _stream, messages in resp:
-            for message_id, entry in messages:
-                try:
-                    process_task(entry, client, message_id)
-                except Exception as e:
-                    logging.error(f"Error processing task: {e}")
-                    health_status["errors"] += 1
+            results.extend(process_messages(messages, stats))
+
+        if results:
+            enqueue((batch_ts, results))
+        publish_stats(stats)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
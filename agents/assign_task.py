@@ -4,19 +4,43 @@ Task Assignment Helper
 Easily assign tasks to specific agents via command line
 """
 
+import argparse
 import requests
 import sys
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def assign_task(agent_id, task_description, api_base="http://127.0.0.1:5006"):
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+AGENTS = frozenset({"codex", "jules", "claude"})
+DEFAULT_API_BASE = "http://127.0.0.1:5006"
+
+# Shared session so repeated assignments reuse one pooled connection
+_SESSION = requests.Session()
+_SESSION.mount(
+    "http://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                max_retries=Retry(total=2, backoff_factor=0.1)),
+)
+
+def assign_task(agent_id, task_description, api_base=DEFAULT_API_BASE):
     """Assign a task to a specific agent"""
     try:
-        response = requests.post(
+        payload = {
+            "task": task_description,
+            "assigned_to": agent_id
+        }
+        body = orjson.dumps(payload) if ORJSON_AVAILABLE else json.dumps(payload)
+        response = _SESSION.post(
             f"{api_base}/add_task",
-            json={
-                "task": task_description,
-                "assigned_to": agent_id
-            },
+            data=body,
+            headers=JSON_HEADERS,
             timeout=5
         )
         
@@ -34,24 +58,59 @@ def assign_task(agent_id, task_description, api_base="http://127.0.0.1:5006"):
         print(f"❌ Error assigning task: {e}")
         return False
 
+def assign_tasks(assignments, api_base=DEFAULT_API_BASE):
+    """Assign several (agent_id, task_description) pairs over one connection
+
+    Returns the number of tasks that were assigned successfully.
+    """
+    assigned = 0
+    for agent_id, task_description in assignments:
+        if assign_task(agent_id, task_description, api_base):
+            assigned += 1
+    return assigned
+
+def load_batch(path):
+    """Read a JSON list of {"agent_id": ..., "task": ...} assignments"""
+    with open(path) as f:
+        entries = json.load(f)
+    return [(entry["agent_id"].lower(), entry["task"]) for entry in entries]
+
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python assign_task.py <agent_id> <task_description>")
-        print("Examples:")
-        print("  python assign_task.py codex 'Analyze system architecture'")
-        print("  python assign_task.py jules 'Monitor API health status'")
-        print("  python assign_task.py claude 'Update dashboard with new metrics'")
-        sys.exit(1)
-    
-    agent_id = sys.argv[1].lower()
-    task_description = " ".join(sys.argv[2:])
-    
-    if agent_id not in ["codex", "jules", "claude"]:
-        print(f"❌ Unknown agent: {agent_id}")
-        print("Available agents: codex, jules, claude")
+    parser = argparse.ArgumentParser(
+        description="Assign tasks to specific agents",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "Examples:\n"
+            "  python assign_task.py codex 'Analyze system architecture'\n"
+            "  python assign_task.py jules 'Monitor API health status'\n"
+            "  python assign_task.py claude 'Update dashboard with new metrics'\n"
+            "  python assign_task.py --batch tasks.json"
+        ),
+    )
+    parser.add_argument("agent_id", nargs="?", type=str.lower, choices=AGENTS,
+                        metavar="agent_id",
+                        help=f"one of: {', '.join(sorted(AGENTS))}")
+    parser.add_argument("task", nargs="*", help="task description")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="JSON list of {agent_id, task} objects, "
+                             "posted over a single connection")
+    parser.add_argument("--api-base", default=DEFAULT_API_BASE)
+    args = parser.parse_args()
+
+    if args.batch:
+        assignments = load_batch(args.batch)
+        unknown = {agent_id for agent_id, _ in assignments} - AGENTS
+        if unknown:
+            parser.error(f"unknown agent(s) in {args.batch}: {', '.join(sorted(unknown))}")
+        assigned = assign_tasks(assignments, args.api_base)
+        print(f"📦 Assigned {assigned}/{len(assignments)} tasks")
+        sys.exit(0 if assigned == len(assignments) else 1)
+
+    if not args.agent_id or not args.task:
+        parser.error("agent_id and task description are required (or use --batch)")
+
+    if not assign_task(args.agent_id, " ".join(args.task), args.api_base):
         sys.exit(1)
-    
-    assign_task(agent_id, task_description)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -4,94 +4,348 @@ CODEX Agent - Automated A2A Task Processor
 Polls for assigned tasks and provides automated responses
 """
 
-import requests
-import time
+import asyncio
+import aiohttp
 import json
 import os
-import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from github_manager import GitHubManager
 from git_manager import GitManager
+from task_router import KeywordRouter
+from project_templates import (
+    RUBIX_CUBE_HTML_BYTES, RUBIX_CUBE_SERVER_PY_BYTES, RUBIX_CUBE_README, DASHBOARD_HTML_BYTES
+)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def dumps(obj):
+    """Serialize to JSON bytes, preferring orjson's native encoder"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=5)
+# The server holds a long-poll for up to LONG_POLL_TIMEOUT seconds
+LONG_POLL_TIMEOUT = 30
+LONG_POLL_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=LONG_POLL_TIMEOUT + 5)
+GITHUB_CACHE_TTL = 60  # seconds a read-only GitHub result is reused
+# A completed task can still be listed by a poll that was answered before
+# the completion, or from another server worker's task list cache. It is
+# only forgotten once a poll started this long after the completion no
+# longer lists it.
+COMPLETED_GRACE = 2.0
+_PROJECTS_DIR = Path(__file__).resolve().parent.parent / "projects"
+
+# Task routing keywords, compiled once; each handler makes one pass over the text
+GITHUB_ROUTER = KeywordRouter([
+    ("test_access", [("test github", "github access")]),
+    ("create_issue", [("create issue",)]),
+    ("list_issues", [("list issues", "get issues")]),
+    ("list_prs", [("list prs", "pull requests")]),
+])
+GIT_ROUTER = KeywordRouter([
+    ("status", [("git status", "check status")]),
+    ("create_branch", [("create branch",)]),
+    ("commit", [("commit changes", "auto commit")]),
+    ("commit_log", [("recent commits", "commit log")]),
+    ("push_branch", [("push branch",)]),
+])
+WEB_ROUTER = KeywordRouter([
+    ("rubix_cube", [("rubix cube", "rubik's cube")]),
+    ("dashboard", [("dashboard",), ("customer", "management")]),
+    ("generic", [("web app", "website", "html", "javascript", "react", "vue")]),
+])
+# Canned acknowledgements for tasks no handler picks up, in priority order
+CANNED_ROUTER = KeywordRouter([
+    ("security", [("security", "repository")]),
+    ("orchestration", [("orchestration",)]),
+    ("private_repo", [("private",), ("repo",)]),
+    ("test", [("test", "demo")]),
+    ("analysis", [("analyze", "analysis")]),
+    ("scenario_3", [("scenario 3", "github integration")]),
+])
+CANNED_RESPONSES = {
+    "security": "🔒 CODEX: Security protocol engaged. Repository access patterns analyzed. Coordinating with Claude for implementation.",
+    "orchestration": "🎼 CODEX: Orchestration capabilities online. Multi-agent coordination protocols active.",
+    "private_repo": "🔐 CODEX: Private repository access confirmed. Authentication protocols ready for implementation.",
+    "test": "🧪 CODEX: Test protocol initiated. System validation in progress.",
+    "analysis": "📊 CODEX: Analysis module activated. Data processing and pattern recognition engaged.",
+    "scenario_3": "🚀 CODEX: Scenario 3 implementation initiated. GitHub API integration protocols active. Phase 1 deployment in progress.",
+}
+# Canned responses are sent over and over; keep their JSON encoding
+_ENCODED_RESPONSES = {text: dumps(text) for text in CANNED_RESPONSES.values()}
+
+def encode_response(text):
+    """JSON-encode a response text, reusing the encoding of canned ones"""
+    encoded = _ENCODED_RESPONSES.get(text)
+    if encoded is None:
+        encoded = dumps(text)
+    return encoded
+
+def write_executable(path, data):
+    """Write bytes to a file created with mode 0o755 (subject to umask)
+
+    The mode is set by the create itself, so no separate chmod is needed.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 class CODEXAgent:
+    # log() timestamp, reformatted at most once per second
+    _last_ts_sec = 0
+    _last_ts_prefix = b""  # b"[<timestamp>] CODEX: "
+    # Managers shared by every agent in the process, created on first use
+    _shared_github = None
+    _shared_git = None
+    
+    @classmethod
+    def shared_github(cls):
+        """GitHubManager shared across agents, so they reuse its connections"""
+        if cls._shared_github is None:
+            cls._shared_github = GitHubManager()
+        return cls._shared_github
+    
+    @classmethod
+    def shared_git(cls):
+        """GitManager shared across agents"""
+        if cls._shared_git is None:
+            cls._shared_git = GitManager.for_path()
+        return cls._shared_git
+    
     def __init__(self, api_base="http://127.0.0.1:5003", agent_id="codex"):
         self.api_base = api_base
         self.agent_id = agent_id
         self.running = False
-        self.poll_interval = 10  # seconds
-        self.github = GitHubManager()  # GitHub API integration
-        self.git = GitManager()  # Git operations
-        self.projects_dir = Path(__file__).parent.parent / "projects"  # Directory for generated projects
-        self.projects_dir.mkdir(exist_ok=True)
+        self.poll_interval = 10  # seconds, only used without long-poll support
+        self.long_poll = True
+        self._http = None  # keep-alive aiohttp session shared by all API calls, opened by run()
+        # Last pending-task list and its ETag; the server answers 304 while
+        # the list is unchanged and the cached copy is reused
+        self._tasks = []
+        self._tasks_etag = None
+        self._in_flight = set()  # IDs of tasks queued but not yet completed
+        self._completed = {}  # ID -> monotonic time, for tasks completed recently
+        # Handlers shell out to git and call GitHub synchronously; run them on
+        # one worker thread so they stay off the event loop but keep their
+        # original one-at-a-time ordering.
+        self._handler_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="codex-handler")
+        # Independent GitHub probes issued by a handler run side by side here
+        self._probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="codex-probe")
+        self.github = self.shared_github()  # GitHub API integration
+        self._github_cache = {}  # method name -> (result, expires_at)
+        self.git = self.shared_git()  # Git operations
+        self.projects_dir = _PROJECTS_DIR  # Directory for generated projects
+        self.projects_dir.mkdir(parents=True, exist_ok=True)
+        self._created_projects = set()  # project directories known to exist
         
     def log(self, message):
-        """Log with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] CODEX: {message}")
-        
-    def get_pending_tasks(self):
+        """Log with timestamp
+        
+        Lines are written to stdout's binary buffer as one pre-encoded
+        chunk, skipping the per-call text encoding of print().
+        """
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._last_ts_prefix = b"[" + timestamp.encode("ascii") + b"] CODEX: "
+            self._last_ts_sec = sec
+        line = self._last_ts_prefix + message.encode("utf-8", "replace") + b"\n"
+        
+        stdout = sys.stdout
+        out = getattr(stdout, "buffer", None)
+        if out is None:  # stdout replaced by a text-only stream
+            print(line.decode("utf-8"), end="")
+            return
+        out.write(line)
+        if stdout.line_buffering:  # interactive terminal: show it now
+            out.flush()
+        
+    async def get_pending_tasks(self):
         """Get pending tasks assigned to this agent"""
         try:
-            response = requests.get(f"{self.api_base}/agent/{self.agent_id}/tasks", timeout=5)
-            if response.status_code == 200:
-                return response.json()
-            return []
+            async with self._http.get(
+                f"{self.api_base}/agent/{self.agent_id}/tasks",
+                headers=self._tasks_headers(),
+                timeout=HTTP_TIMEOUT
+            ) as response:
+                if response.status in (200, 304):
+                    return await self._read_tasks(response)
+                return []
         except Exception as e:
             self.log(f"Error fetching tasks: {e}")
             return []
     
-    def acknowledge_task(self, task_id):
+    async def wait_for_tasks(self):
+        """Long-poll for pending tasks
+
+        Returns as soon as tasks are assigned (or [] after LONG_POLL_TIMEOUT),
+        or None if the server has no long-poll endpoint. Transport errors
+        propagate so the caller can back off.
+        """
+        async with self._http.get(
+            f"{self.api_base}/agent/{self.agent_id}/tasks/wait",
+            params={"timeout": LONG_POLL_TIMEOUT},
+            headers=self._tasks_headers(),
+            timeout=LONG_POLL_HTTP_TIMEOUT
+        ) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            return await self._read_tasks(response)
+    
+    def _tasks_headers(self):
+        """Conditional request headers for the pending-task endpoints"""
+        if self._tasks_etag:
+            return {"If-None-Match": self._tasks_etag}
+        return None
+    
+    async def _read_tasks(self, response):
+        """Decode a pending-task list, reusing the cached one on 304"""
+        if response.status == 304:
+            return self._tasks
+        self._tasks = loads(await response.read())
+        self._tasks_etag = response.headers.get("ETag")
+        return self._tasks
+    
+    async def acknowledge_task(self, task_id):
         """Acknowledge receiving a task"""
         try:
-            response = requests.post(
+            async with self._http.post(
                 f"{self.api_base}/agent/{self.agent_id}/tasks/{task_id}/acknowledge",
-                timeout=5
-            )
-            return response.status_code == 200
+                timeout=HTTP_TIMEOUT
+            ) as response:
+                return response.status == 200
         except Exception as e:
             self.log(f"Error acknowledging task {task_id}: {e}")
             return False
     
-    def complete_task(self, task_id, response_text):
+    async def complete_task(self, task_id, response_text):
         """Mark task as completed with response"""
         try:
-            response = requests.post(
+            async with self._http.post(
                 f"{self.api_base}/agent/{self.agent_id}/tasks/{task_id}/complete",
-                json={"response": response_text},
-                timeout=5
-            )
-            return response.status_code == 200
+                data=b'{"response":' + encode_response(response_text) + b"}",
+                headers=JSON_HEADERS,
+                timeout=HTTP_TIMEOUT
+            ) as response:
+                return response.status == 200
         except Exception as e:
             self.log(f"Error completing task {task_id}: {e}")
             return False
     
+    async def acknowledge_tasks(self, task_ids):
+        """Acknowledge several tasks in one request; returns the acknowledged IDs"""
+        try:
+            async with self._http.post(
+                f"{self.api_base}/agent/{self.agent_id}/tasks/acknowledge_bulk",
+                data=dumps({"ids": task_ids}),
+                headers=JSON_HEADERS,
+                timeout=HTTP_TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    return set(loads(await response.read())["acknowledged"])
+                if response.status != 404:
+                    return set()
+        except Exception as e:
+            self.log(f"Error acknowledging tasks {task_ids}: {e}")
+            return set()
+        
+        # Server without the bulk endpoint: one request per task
+        results = await asyncio.gather(*(self.acknowledge_task(task_id) for task_id in task_ids))
+        return {task_id for task_id, ok in zip(task_ids, results) if ok}
+    
+    async def complete_tasks(self, responses):
+        """Complete several tasks in one request; returns the completed IDs
+
+        responses maps task ID to response text.
+        """
+        try:
+            async with self._http.post(
+                f"{self.api_base}/agent/{self.agent_id}/tasks/complete_bulk",
+                data=b'{"results":[' + b",".join(
+                    b'{"id":' + dumps(task_id) + b',"response":' + encode_response(text) + b"}"
+                    for task_id, text in responses.items()
+                ) + b"]}",
+                headers=JSON_HEADERS,
+                timeout=HTTP_TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    return set(loads(await response.read())["completed"])
+                if response.status != 404:
+                    return set()
+        except Exception as e:
+            self.log(f"Error completing tasks {list(responses)}: {e}")
+            return set()
+        
+        # Server without the bulk endpoint: one request per task
+        results = await asyncio.gather(*(
+            self.complete_task(task_id, text) for task_id, text in responses.items()
+        ))
+        return {task_id for task_id, ok in zip(responses, results) if ok}
+    
+    def cached_github_call(self, method_name):
+        """Call a read-only GitHubManager method, reusing a recent success
+
+        Repeated tasks within GITHUB_CACHE_TTL answer from memory instead of
+        spending GitHub rate limit. Failures are never cached.
+        """
+        now = time.monotonic()
+        cached = self._github_cache.get(method_name)
+        if cached and cached[1] > now:
+            return cached[0]
+        
+        result = getattr(self.github, method_name)()
+        if result.get("success"):
+            self._github_cache[method_name] = (result, now + GITHUB_CACHE_TTL)
+        return result
+    
     def test_github_access(self):
         """Test GitHub API access and authentication"""
         self.log("Testing GitHub API access...")
         
-        # Test authentication
-        auth_result = self.github.test_authentication()
-        self.log(f"GitHub Auth: {auth_result['message']}")
+        # Authentication and repository access are independent requests, so
+        # the probe costs one GitHub round trip instead of two
+        auth_future = self._probe_executor.submit(self.cached_github_call, "test_authentication")
+        repo_future = self._probe_executor.submit(self.cached_github_call, "get_repo_info")
+        auth_result = auth_future.result()
+        repo_result = repo_future.result()
         
-        # Test repository access
-        repo_result = self.github.get_repo_info()
+        self.log(f"GitHub Auth: {auth_result['message']}")
         self.log(f"GitHub Repo: {repo_result['message']}")
         
         return auth_result["success"] and repo_result["success"]
     
-    def handle_github_task(self, task_text):
+    def handle_github_task(self, task_text, task_text_lower=None):
         """Handle GitHub-related tasks"""
-        task_lower = task_text.lower()
+        if task_text_lower is None:
+            task_text_lower = task_text.lower()
+        action = GITHUB_ROUTER.route(task_text_lower)
         
-        if "test github" in task_lower or "github access" in task_lower:
+        if action == "test_access":
             success = self.test_github_access()
             if success:
                 return "🔗 CODEX: GitHub API access confirmed. Authentication successful, repository access verified."
             else:
                 return "⚠️ CODEX: GitHub API access failed. Token configuration required for repository operations."
         
-        elif "create issue" in task_lower:
+        elif action == "create_issue":
             # Example: "create issue: Bug in dashboard refresh"
             if ":" in task_text:
                 title = task_text.split(":", 1)[1].strip()
@@ -100,19 +354,21 @@ class CODEXAgent:
                     body=f"Issue created by CODEX agent at {datetime.now().isoformat()}",
                     labels=["automated", "codex"]
                 )
+                if result["success"]:
+                    self._github_cache.pop("get_issues", None)
                 return f"📋 CODEX: {result['message']}"
             else:
                 return "📋 CODEX: Issue creation requires format 'create issue: <title>'"
         
-        elif "list issues" in task_lower or "get issues" in task_lower:
-            result = self.github.get_issues()
+        elif action == "list_issues":
+            result = self.cached_github_call("get_issues")
             if result["success"]:
                 return f"📋 CODEX: Found {result['count']} open issues in repository."
             else:
                 return f"❌ CODEX: Failed to fetch issues - {result['message']}"
         
-        elif "list prs" in task_lower or "pull requests" in task_lower:
-            result = self.github.get_pull_requests()
+        elif action == "list_prs":
+            result = self.cached_github_call("get_pull_requests")
             if result["success"]:
                 return f"🔀 CODEX: Found {result['count']} open pull requests in repository."
             else:
@@ -120,18 +376,20 @@ class CODEXAgent:
         
         return None  # Not a GitHub task
     
-    def handle_git_task(self, task_text):
+    def handle_git_task(self, task_text, task_text_lower=None):
         """Handle Git-related tasks"""
-        task_lower = task_text.lower()
+        if task_text_lower is None:
+            task_text_lower = task_text.lower()
+        action = GIT_ROUTER.route(task_text_lower)
         
-        if "git status" in task_lower or "check status" in task_lower:
+        if action == "status":
             status = self.git.get_status()
             if status["success"]:
                 return f"📊 CODEX: Git status - Branch: {status['branch']}, Modified: {len(status['modified'])}, Untracked: {len(status['untracked'])}, Staged: {len(status['staged'])}, Clean: {status['clean']}"
             else:
                 return f"❌ CODEX: Git status failed - {status['error']}"
         
-        elif "create branch" in task_lower:
+        elif action == "create_branch":
             # Example: "create branch: feature-automated-deployment"
             if ":" in task_text:
                 branch_name = task_text.split(":", 1)[1].strip()
@@ -140,7 +398,7 @@ class CODEXAgent:
             else:
                 return "🌿 CODEX: Branch creation requires format 'create branch: <name>'"
         
-        elif "commit changes" in task_lower or "auto commit" in task_lower:
+        elif action == "commit":
             # Extract commit message if provided
             commit_msg = f"CODEX automated commit: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             if ":" in task_text:
@@ -156,7 +414,7 @@ class CODEXAgent:
             else:
                 return f"❌ CODEX: Workflow failed - {result['error']}"
         
-        elif "recent commits" in task_lower or "commit log" in task_lower:
+        elif action == "commit_log":
             commits = self.git.get_commit_log(3)
             if commits:
                 commit_summary = ", ".join([f"{c['hash']}: {c['message'][:30]}..." for c in commits[:2]])
@@ -164,364 +422,57 @@ class CODEXAgent:
             else:
                 return "📜 CODEX: No recent commits found"
         
-        elif "push branch" in task_lower:
+        elif action == "push_branch":
             current_branch = self.git.get_current_branch()
             result = self.git.push_branch()
             return f"🚀 CODEX: {result['message']}"
         
         return None  # Not a Git task
     
-    def handle_web_project_task(self, task_text):
+    def handle_web_project_task(self, task_text, task_text_lower=None):
         """Handle web development project tasks"""
-        task_lower = task_text.lower()
-        
-        # Check if this is a Rubix Cube project
-        if "rubix cube" in task_lower or "rubik's cube" in task_lower:
-            return self.create_rubix_cube_project(task_text)
-        
-        # Check for other web projects
-        elif "dashboard" in task_lower and ("customer" in task_lower or "management" in task_lower):
-            return self.create_dashboard_project(task_text)
-        
-        elif any(keyword in task_lower for keyword in ["web app", "website", "html", "javascript", "react", "vue"]):
-            return self.create_generic_web_project(task_text)
-        
+        if task_text_lower is None:
+            task_text_lower = task_text.lower()
+        handler = {
+            "rubix_cube": self.create_rubix_cube_project,
+            "dashboard": self.create_dashboard_project,
+            "generic": self.create_generic_web_project,
+        }.get(WEB_ROUTER.route(task_text_lower))
+        
+        if handler:
+            return handler(task_text)
         return None  # Not a web project task
     
+    def project_path(self, project_name):
+        """Return a generated project's directory, creating it on first use"""
+        project_path = self.projects_dir / project_name
+        if project_name not in self._created_projects:
+            project_path.mkdir(exist_ok=True)
+            self._created_projects.add(project_name)
+        return project_path
+    
     def create_rubix_cube_project(self, task_text):
         """Create an interactive 3D Rubix Cube application"""
         try:
             project_name = "rubix-cube-3d"
-            project_path = self.projects_dir / project_name
-            project_path.mkdir(exist_ok=True)
-            
-            # Create the HTML file
-            html_content = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Interactive Rubix Cube 3D</title>
-    <style>
-        body {
-            margin: 0;
-            padding: 0;
-            background: #000;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 100vh;
-            font-family: Arial, sans-serif;
-            overflow: hidden;
-        }
-        
-        .cube-container {
-            perspective: 1000px;
-            transform-style: preserve-3d;
-        }
-        
-        .cube {
-            width: 300px;
-            height: 300px;
-            position: relative;
-            transform-style: preserve-3d;
-            transition: transform 0.3s ease;
-            cursor: grab;
-        }
-        
-        .cube:active {
-            cursor: grabbing;
-        }
-        
-        .face {
-            position: absolute;
-            width: 300px;
-            height: 300px;
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            grid-template-rows: repeat(3, 1fr);
-            gap: 2px;
-            border: 3px solid #333;
-        }
-        
-        .square {
-            border: 1px solid #222;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-weight: bold;
-            font-size: 12px;
-        }
-        
-        /* Face positioning */
-        .front { transform: rotateY(0deg) translateZ(150px); }
-        .back { transform: rotateY(180deg) translateZ(150px); }
-        .right { transform: rotateY(90deg) translateZ(150px); }
-        .left { transform: rotateY(-90deg) translateZ(150px); }
-        .top { transform: rotateX(90deg) translateZ(150px); }
-        .bottom { transform: rotateX(-90deg) translateZ(150px); }
-        
-        /* Face colors */
-        .front .square { background: #ff0000; } /* Red */
-        .back .square { background: #ff8c00; } /* Orange */
-        .right .square { background: #0000ff; } /* Blue */
-        .left .square { background: #00ff00; } /* Green */
-        .top .square { background: #ffffff; color: #000; } /* White */
-        .bottom .square { background: #ffff00; color: #000; } /* Yellow */
-        
-        .controls {
-            position: absolute;
-            top: 20px;
-            left: 20px;
-            color: white;
-            z-index: 100;
-        }
-        
-        .controls h2 {
-            margin: 0 0 10px 0;
-            color: #fff;
-        }
-        
-        .controls p {
-            margin: 5px 0;
-            color: #ccc;
-        }
-        
-        .info {
-            position: absolute;
-            bottom: 20px;
-            right: 20px;
-            color: #888;
-            font-size: 12px;
-        }
-    </style>
-</head>
-<body>
-    <div class="controls">
-        <h2>🎮 Rubix Cube 3D</h2>
-        <p>🖱️ Drag to rotate</p>
-        <p>⬅️➡️ Arrow keys: Horizontal</p>
-        <p>⬆️⬇️ Arrow keys: Vertical</p>
-    </div>
-    
-    <div class="cube-container">
-        <div class="cube" id="cube">
-            <!-- Front face -->
-            <div class="face front">
-                <div class="square">R1</div><div class="square">R2</div><div class="square">R3</div>
-                <div class="square">R4</div><div class="square">R5</div><div class="square">R6</div>
-                <div class="square">R7</div><div class="square">R8</div><div class="square">R9</div>
-            </div>
-            
-            <!-- Back face -->
-            <div class="face back">
-                <div class="square">O1</div><div class="square">O2</div><div class="square">O3</div>
-                <div class="square">O4</div><div class="square">O5</div><div class="square">O6</div>
-                <div class="square">O7</div><div class="square">O8</div><div class="square">O9</div>
-            </div>
-            
-            <!-- Right face -->
-            <div class="face right">
-                <div class="square">B1</div><div class="square">B2</div><div class="square">B3</div>
-                <div class="square">B4</div><div class="square">B5</div><div class="square">B6</div>
-                <div class="square">B7</div><div class="square">B8</div><div class="square">B9</div>
-            </div>
-            
-            <!-- Left face -->
-            <div class="face left">
-                <div class="square">G1</div><div class="square">G2</div><div class="square">G3</div>
-                <div class="square">G4</div><div class="square">G5</div><div class="square">G6</div>
-                <div class="square">G7</div><div class="square">G8</div><div class="square">G9</div>
-            </div>
-            
-            <!-- Top face -->
-            <div class="face top">
-                <div class="square">W1</div><div class="square">W2</div><div class="square">W3</div>
-                <div class="square">W4</div><div class="square">W5</div><div class="square">W6</div>
-                <div class="square">W7</div><div class="square">W8</div><div class="square">W9</div>
-            </div>
-            
-            <!-- Bottom face -->
-            <div class="face bottom">
-                <div class="square">Y1</div><div class="square">Y2</div><div class="square">Y3</div>
-                <div class="square">Y4</div><div class="square">Y5</div><div class="square">Y6</div>
-                <div class="square">Y7</div><div class="square">Y8</div><div class="square">Y9</div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="info">
-        Built by FlowForge CODEX Agent | 🤖 A2A System
-    </div>
-    
-    <script>
-        const cube = document.getElementById('cube');
-        let rotationX = -15;
-        let rotationY = 15;
-        let isDragging = false;
-        let previousMouseX = 0;
-        let previousMouseY = 0;
-        
-        function updateCubeRotation() {
-            cube.style.transform = `rotateX(${rotationX}deg) rotateY(${rotationY}deg)`;
-        }
-        
-        // Mouse controls
-        cube.addEventListener('mousedown', (e) => {
-            isDragging = true;
-            previousMouseX = e.clientX;
-            previousMouseY = e.clientY;
-            e.preventDefault();
-        });
-        
-        document.addEventListener('mousemove', (e) => {
-            if (!isDragging) return;
-            
-            const deltaX = e.clientX - previousMouseX;
-            const deltaY = e.clientY - previousMouseY;
-            
-            rotationY += deltaX * 0.5;
-            rotationX -= deltaY * 0.5;
-            
-            // Limit vertical rotation
-            rotationX = Math.max(-90, Math.min(90, rotationX));
-            
-            updateCubeRotation();
-            
-            previousMouseX = e.clientX;
-            previousMouseY = e.clientY;
-        });
-        
-        document.addEventListener('mouseup', () => {
-            isDragging = false;
-        });
-        
-        // Keyboard controls
-        document.addEventListener('keydown', (e) => {
-            switch(e.key) {
-                case 'ArrowLeft':
-                    rotationY -= 15;
-                    break;
-                case 'ArrowRight':
-                    rotationY += 15;
-                    break;
-                case 'ArrowUp':
-                    rotationX -= 15;
-                    rotationX = Math.max(-90, Math.min(90, rotationX));
-                    break;
-                case 'ArrowDown':
-                    rotationX += 15;
-                    rotationX = Math.max(-90, Math.min(90, rotationX));
-                    break;
-                default:
-                    return;
-            }
-            updateCubeRotation();
-            e.preventDefault();
-        });
-        
-        // Initialize position
-        updateCubeRotation();
-        
-        // Auto-rotation demo (optional)
-        let autoRotate = false;
-        setInterval(() => {
-            if (!isDragging && autoRotate) {
-                rotationY += 0.5;
-                updateCubeRotation();
-            }
-        }, 50);
-        
-        // Enable auto-rotation on 'a' key press
-        document.addEventListener('keydown', (e) => {
-            if (e.key.toLowerCase() === 'a') {
-                autoRotate = !autoRotate;
-            }
-        });
-    </script>
-</body>
-</html>'''
+            project_path = self.project_path(project_name)
             
             # Write the HTML file
             html_file = project_path / "index.html"
-            html_file.write_text(html_content)
+            html_file.write_bytes(RUBIX_CUBE_HTML_BYTES)
             
             # Create a simple server script
-            server_content = '''#!/usr/bin/env python3
-"""
-Simple HTTP server for Rubix Cube 3D
-"""
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import os
-import webbrowser
-from pathlib import Path
-
-class CubeHandler(SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=str(Path(__file__).parent), **kwargs)
-
-if __name__ == "__main__":
-    port = 8080
-    server = HTTPServer(('localhost', port), CubeHandler)
-    
-    print(f"🎮 Rubix Cube 3D Server")
-    print(f"📱 Open: http://localhost:{port}")
-    print(f"🎯 Built by FlowForge CODEX Agent")
-    print(f"🚀 Press Ctrl+C to stop")
-    
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\\n🛑 Server stopped")
-'''
-            
             server_file = project_path / "server.py"
-            server_file.write_text(server_content)
-            server_file.chmod(0o755)
+            write_executable(server_file, RUBIX_CUBE_SERVER_PY_BYTES)
             
             # Create a README
-            readme_content = f'''# 🎮 Rubix Cube 3D
-
-Interactive 3D Rubix Cube created by FlowForge CODEX Agent.
-
-## Features
-- ✅ 3D CSS cube with 6 colored faces
-- ✅ Mouse drag rotation (L/R and Up/Down)
-- ✅ Keyboard arrow key controls
-- ✅ Smooth animations and transitions
-- ✅ Black background as requested
-- ✅ No puzzle logic (display only)
-
-## Usage
-
-### Method 1: Python Server
-```bash
-cd {project_path.name}
-python server.py
-```
-Then open: http://localhost:8080
-
-### Method 2: Direct File
-Open `index.html` directly in your browser.
-
-## Controls
-- 🖱️ **Mouse**: Drag to rotate the cube
-- ⬅️➡️ **Arrow Keys**: Rotate horizontally
-- ⬆️⬇️ **Arrow Keys**: Rotate vertically  
-- **A Key**: Toggle auto-rotation
-
-## Technical Details
-- Pure HTML/CSS/JavaScript
-- CSS 3D transforms and perspective
-- No external dependencies
-- Responsive design
-- Created: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-Built by **FlowForge CODEX Agent** 🤖
-'''
+            readme_content = RUBIX_CUBE_README.format(
+                project_dir=project_path.name,
+                created=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            )
             
             readme_file = project_path / "README.md"
-            readme_file.write_text(readme_content)
+            readme_file.write_bytes(readme_content.encode("utf-8"))
             
             return f"🎮 CODEX: Rubix Cube 3D created successfully! \\n📍 Location: {project_path}\\n🌐 Run: python {project_path}/server.py\\n📱 Then open: http://localhost:8080"
             
@@ -532,16 +483,10 @@ Built by **FlowForge CODEX Agent** 🤖
         """Create a customer dashboard project"""
         try:
             project_name = "customer-dashboard"
-            project_path = self.projects_dir / project_name
-            project_path.mkdir(exist_ok=True)
-            
-            # Simple dashboard HTML (abbreviated for space)
-            html_content = '''<!DOCTYPE html>
-<html><head><title>Customer Dashboard</title></head>
-<body><h1>Customer Management Dashboard</h1><p>Basic dashboard created by CODEX Agent</p></body></html>'''
+            project_path = self.project_path(project_name)
             
             html_file = project_path / "index.html"
-            html_file.write_text(html_content)
+            html_file.write_bytes(DASHBOARD_HTML_BYTES)
             
             return f"📊 CODEX: Customer Dashboard created at {project_path}"
             
@@ -552,79 +497,165 @@ Built by **FlowForge CODEX Agent** 🤖
         """Create a generic web project"""
         return "🌐 CODEX: Generic web project handler - specify project type for implementation"
     
-    def process_task(self, task):
-        """Process a task and generate appropriate response"""
+    async def poll_stage(self, task_queue):
+        """Pipeline stage 1: fetch new tasks, acknowledge them and queue them
+        
+        Tasks still moving through the pipeline, or completed moments ago,
+        are skipped when they show up in a later poll. A None sentinel tells
+        the next stage to stop.
+        """
+        try:
+            while self.running:
+                try:
+                    # Get pending tasks
+                    started = time.monotonic()
+                    if self.long_poll:
+                        tasks = await self.wait_for_tasks()
+                        if tasks is None:
+                            self.log("Server has no long-poll endpoint, falling back to polling")
+                            self.long_poll = False
+                            continue
+                    else:
+                        tasks = await self.get_pending_tasks()
+                    
+                    listed = {task["id"] for task in tasks}
+                    self._forget_completed(listed, started)
+                    new_tasks = [
+                        task for task in tasks
+                        if task["id"] not in self._in_flight and task["id"] not in self._completed
+                    ]
+                    if new_tasks:
+                        self.log(f"Found {len(new_tasks)} pending tasks")
+                        task_ids = [task["id"] for task in new_tasks]
+                        self._in_flight.update(task_ids)
+                        for task_id in await self.acknowledge_tasks(task_ids):
+                            self.log(f"Acknowledged task {task_id}")
+                        for task in new_tasks:
+                            task_queue.put_nowait(task)
+                    
+                    # Plain polling always waits between requests; a long-poll
+                    # only has to when it brought back nothing new
+                    if not self.long_poll or (tasks and not new_tasks):
+                        await asyncio.sleep(self.poll_interval)
+                    
+                except Exception as e:
+                    self.log(f"Error in main loop: {e}")
+                    await asyncio.sleep(30)  # Wait longer on error
+        finally:
+            task_queue.put_nowait(None)
+    
+    async def handle_stage(self, task_queue, complete_queue):
+        """Pipeline stage 2: generate responses on the handler thread"""
+        loop = asyncio.get_running_loop()
+        while True:
+            task = await task_queue.get()
+            if task is None:
+                complete_queue.put_nowait(None)
+                return
+            try:
+                response = await loop.run_in_executor(
+                    self._handler_executor, self.generate_response, task
+                )
+            except Exception as e:
+                self.log(f"Error handling task {task['id']}: {e}")
+                self._in_flight.discard(task["id"])  # retried by a later poll
+                continue
+            complete_queue.put_nowait((task["id"], response))
+    
+    async def complete_stage(self, complete_queue):
+        """Pipeline stage 3: post responses, batching whatever is ready
+        
+        Responses that pile up while a completion request is out go together
+        in the next bulk request.
+        """
+        done = False
+        while not done:
+            responses = {}
+            item = await complete_queue.get()
+            while True:
+                if item is None:
+                    done = True
+                    break
+                responses[item[0]] = item[1]
+                if complete_queue.empty():
+                    break
+                item = complete_queue.get_nowait()
+            
+            if responses:
+                completed = await self.complete_tasks(responses)
+                completed_at = time.monotonic()
+                for task_id in completed:
+                    self.log(f"Completed task {task_id}")
+                    self._completed[task_id] = completed_at
+                # Failed completions stay pending and are picked up again
+                self._in_flight.difference_update(responses)
+    
+    def _forget_completed(self, listed, started):
+        """Drop completed tasks that a poll started at started no longer lists
+
+        Only polls started COMPLETED_GRACE seconds after a completion are
+        trusted to reflect it.
+        """
+        stale = [
+            task_id for task_id, completed_at in self._completed.items()
+            if started - completed_at >= COMPLETED_GRACE and task_id not in listed
+        ]
+        for task_id in stale:
+            del self._completed[task_id]
+    
+    def generate_response(self, task):
+        """Generate the response text for a task"""
         task_text = task["task"]
         task_text_lower = task_text.lower()
-        task_id = task["id"]
-        
-        # Acknowledge the task first
-        if self.acknowledge_task(task_id):
-            self.log(f"Acknowledged task {task_id}: {task['task'][:50]}...")
         
-        # Try web development tasks first
-        web_response = self.handle_web_project_task(task_text)
-        if web_response:
-            response = web_response
-        else:
-            # Try GitHub operations
-            github_response = self.handle_github_task(task_text)
-            if github_response:
-                response = github_response
-            else:
-                # Try Git operations
-                git_response = self.handle_git_task(task_text)
-                if git_response:
-                    response = git_response
-                else:
-                    # Generate response based on task content
-                    response = "🤖 CODEX acknowledged and processing..."
-                
-                if "security" in task_text_lower or "repository" in task_text_lower:
-                    response = "🔒 CODEX: Security protocol engaged. Repository access patterns analyzed. Coordinating with Claude for implementation."
-                elif "orchestration" in task_text_lower:
-                    response = "🎼 CODEX: Orchestration capabilities online. Multi-agent coordination protocols active."
-                elif "private" in task_text_lower and "repo" in task_text_lower:
-                    response = "🔐 CODEX: Private repository access confirmed. Authentication protocols ready for implementation."
-                elif "test" in task_text_lower or "demo" in task_text_lower:
-                    response = "🧪 CODEX: Test protocol initiated. System validation in progress."
-                elif "analyze" in task_text_lower or "analysis" in task_text_lower:
-                    response = "📊 CODEX: Analysis module activated. Data processing and pattern recognition engaged."
-                elif "scenario 3" in task_text_lower or "github integration" in task_text_lower:
-                    response = "🚀 CODEX: Scenario 3 implementation initiated. GitHub API integration protocols active. Phase 1 deployment in progress."
-                else:
-                    response = f"🤖 CODEX: Task received and acknowledged. Processing: {task['task'][:30]}..."
+        # Web projects first, then GitHub, then Git; the first handler that
+        # claims the task wins
+        for handler in (self.handle_web_project_task, self.handle_github_task, self.handle_git_task):
+            response = handler(task_text, task_text_lower)
+            if response:
+                return response
         
-        # Complete the task
-        if self.complete_task(task_id, response):
-            self.log(f"Completed task {task_id}")
-            return True
-        return False
+        # Generate response based on task content
+        return self.canned_response(task_text, task_text_lower)
+    
+    def canned_response(self, task_text, task_text_lower):
+        """Pick a canned acknowledgement from the task keywords"""
+        route = CANNED_ROUTER.route(task_text_lower)
+        if route:
+            return CANNED_RESPONSES[route]
+        return f"🤖 CODEX: Task received and acknowledged. Processing: {task_text[:30]}..."
+    
+    async def run(self):
+        """Agent task pipeline over one keep-alive HTTP session"""
+        # A handful of pooled connections covers the long-poll plus the bulk
+        # ack/complete calls; idle ones stay open between polls.
+        connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=60)
+        self._http = aiohttp.ClientSession(connector=connector)
+        # Polling, handling and completing overlap: the next poll is already
+        # waiting while earlier tasks are being handled and completed
+        task_queue = asyncio.Queue()
+        complete_queue = asyncio.Queue()
+        try:
+            await asyncio.gather(
+                self.poll_stage(task_queue),
+                self.handle_stage(task_queue, complete_queue),
+                self.complete_stage(complete_queue),
+            )
+        finally:
+            await self._http.close()
+            self._http = None
     
     def start(self):
         """Start the agent polling loop"""
         self.running = True
         self.log("CODEX Agent starting up...")
-        self.log(f"Polling {self.api_base} every {self.poll_interval} seconds")
+        self.log(f"Long-polling {self.api_base} for tasks")
         
-        while self.running:
-            try:
-                # Get pending tasks
-                tasks = self.get_pending_tasks()
-                
-                if tasks:
-                    self.log(f"Found {len(tasks)} pending tasks")
-                    for task in tasks:
-                        self.process_task(task)
-                
-                time.sleep(self.poll_interval)
-                
-            except KeyboardInterrupt:
-                self.log("Shutting down...")
-                self.running = False
-            except Exception as e:
-                self.log(f"Error in main loop: {e}")
-                time.sleep(30)  # Wait longer on error
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.log("Shutting down...")
+            self.running = False
     
     def stop(self):
         """Stop the agent"""
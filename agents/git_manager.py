@@ -4,13 +4,64 @@ Git Operations Manager for A2A Agents
 Handles local git operations, branch management, and automated workflows
 """
 
+import heapq
+import re
 import subprocess
 import os
 import tempfile
+import shlex
 import shutil
+import threading
+import weakref
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+# Printed before each step of a workflow script, followed by the step name
+WORKFLOW_STEP_MARKER = "@@a2a-step:"
+# `git status --porcelain` codes, as byte values
+_STAGED_CODES = frozenset(b"MADRC")
+_MODIFIED_CODES = frozenset(b"MD")
+_RENAME_CODES = frozenset(b"RC")  # followed by a record with the source path
+_UNTRACKED_CODE = ord("?")
+# One `git log --pretty=format:%h%x00%an%x00%ad%x00%s` record
+_LOG_RECORD = re.compile(
+    r"^(?P<hash>[0-9a-f]+)\x00(?P<author>[^\x00\n]*)\x00(?P<date>[^\x00\n]*)\x00(?P<message>[^\n]*)$",
+    re.M
+)
+# Seconds a cat-file batch lookup may take, like the other git calls
+CAT_FILE_TIMEOUT = 30
+# Commands that can move HEAD to another branch
+_BRANCH_CHANGING_COMMANDS = frozenset({"checkout", "switch", "branch"})
+
+# Working directory -> enclosing repository root, from earlier walk-ups
+_REPO_ROOTS: Dict[Path, Path] = {}
+# Live GitManager per resolved repository path, see GitManager.for_path()
+_GM_CACHE: "weakref.WeakValueDictionary[Path, GitManager]" = weakref.WeakValueDictionary()
+_GM_CACHE_LOCK = threading.Lock()
+
+def _decode(value: bytes) -> str:
+    """Decode git output for callers that want text"""
+    return value.decode("utf-8", "replace") if value else ""
+
+def _find_repo_root(start: Path) -> Path:
+    """Walk up from start to the directory holding .git (start if none)"""
+    root = _REPO_ROOTS.get(start)
+    if root is not None:
+        return root
+    current = start
+    while current != current.parent:
+        if (current / ".git").exists():
+            _REPO_ROOTS[start] = current
+            return current
+        current = current.parent
+    return start
 
 class GitManager:
     def __init__(self, repo_path: str = None):
@@ -19,16 +70,42 @@ class GitManager:
             self.repo_path = Path(repo_path)
         else:
             # Find git repo by walking up from current directory
-            current = Path.cwd()
-            while current != current.parent:
-                if (current / ".git").exists():
-                    self.repo_path = current
-                    break
-                current = current.parent
-            else:
-                self.repo_path = Path.cwd()
+            self.repo_path = _find_repo_root(Path.cwd())
         
         self.ensure_git_repo()
+        
+        # Long-lived `git cat-file --batch` for read-only object lookups,
+        # started on first use; the lock keeps request/response pairs intact
+        self._cat_file: Optional[subprocess.Popen] = None
+        self._cat_file_lock = threading.Lock()
+        
+        # (HEAD file signature, branch name) from the last branch lookup
+        self._branch_cache: Optional[Tuple[Any, str]] = None
+        
+        # In-process libgit2 handle for read-only lookups, when available
+        self._repo = None
+        if PYGIT2_AVAILABLE:
+            try:
+                self._repo = pygit2.Repository(str(self.repo_path))
+            except pygit2.GitError:
+                self._repo = None
+    
+    @classmethod
+    def for_path(cls, repo_path: str = None) -> "GitManager":
+        """Return the live manager for a repository, creating it on first use
+        
+        Instances are shared per resolved path for as long as someone holds
+        a reference, so repeated lookups skip the walk-up and .git check.
+        """
+        if repo_path:
+            key = Path(repo_path).resolve()
+        else:
+            key = _find_repo_root(Path.cwd().resolve())
+        with _GM_CACHE_LOCK:
+            manager = _GM_CACHE.get(key)
+            if manager is None:
+                manager = _GM_CACHE[key] = cls(str(key))
+            return manager
     
     def ensure_git_repo(self):
         """Ensure we're in a git repository"""
@@ -36,22 +113,28 @@ class GitManager:
             raise ValueError(f"Not a git repository: {self.repo_path}")
     
     def run_git_command(self, command: List[str], capture_output: bool = True) -> Dict[str, Any]:
-        """Run a git command and return result"""
+        """Run a git command and return result
+        
+        Output is captured as bytes and only decoded once stripped and
+        non-empty.
+        """
+        if command and command[0] in _BRANCH_CHANGING_COMMANDS:
+            self._branch_cache = None
         try:
             full_command = ["git"] + command
             result = subprocess.run(
                 full_command,
                 cwd=self.repo_path,
                 capture_output=capture_output,
-                text=True,
                 timeout=30
             )
             
+            stdout = result.stdout.strip() if result.stdout else b""
             return {
                 "success": result.returncode == 0,
                 "returncode": result.returncode,
-                "stdout": result.stdout.strip() if result.stdout else "",
-                "stderr": result.stderr.strip() if result.stderr else "",
+                "stdout": _decode(stdout),
+                "stderr": _decode(result.stderr.strip() if result.stderr else b""),
                 "command": " ".join(full_command)
             }
         except subprocess.TimeoutExpired:
@@ -67,44 +150,225 @@ class GitManager:
                 "command": " ".join(full_command)
             }
     
+    def run_git_script(self, script: str, timeout: int = 120) -> Dict[str, Any]:
+        """Run several git commands as one shell script in the repo
+        
+        Values interpolated into the script must be quoted with shlex.quote.
+        """
+        self._branch_cache = None
+        try:
+            result = subprocess.run(
+                ["bash", "-c", script],
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            
+            return {
+                "success": result.returncode == 0,
+                "returncode": result.returncode,
+                "stdout": result.stdout.strip() if result.stdout else "",
+                "stderr": result.stderr.strip() if result.stderr else "",
+                "command": script
+            }
+        except subprocess.TimeoutExpired as e:
+            return {
+                "success": False,
+                "error": "Command timeout",
+                "stdout": e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or ""),
+                "command": script
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "stdout": "",
+                "command": script
+            }
+    
+    def read_object(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """Look up an object in-process with pygit2, else through the cat-file batch process
+        
+        Returns (object id, type, content), or None if the revision does not
+        resolve or the batch process is unavailable.
+        """
+        if "\n" in rev:
+            return None
+        if self._repo is not None:
+            try:
+                obj = self._repo.revparse_single(rev)
+                return str(obj.id), obj.type_str, obj.read_raw()
+            except (KeyError, ValueError, pygit2.GitError):
+                return None
+        with self._cat_file_lock:
+            try:
+                proc = self._cat_file
+                if proc is None or proc.poll() is not None:
+                    proc = self._cat_file = subprocess.Popen(
+                        ["git", "cat-file", "--batch"],
+                        cwd=self.repo_path,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL
+                    )
+                # A stalled process is killed, which ends the reads below
+                watchdog = threading.Timer(CAT_FILE_TIMEOUT, proc.kill)
+                watchdog.daemon = True
+                watchdog.start()
+                try:
+                    proc.stdin.write(rev.encode() + b"\n")
+                    proc.stdin.flush()
+                    line = proc.stdout.readline()
+                    header = line.split()
+                    if len(header) == 3:
+                        object_id, object_type, size = header
+                        content = proc.stdout.read(int(size))
+                        trailer = proc.stdout.read(1)
+                finally:
+                    watchdog.cancel()
+                if not line.endswith(b"\n"):
+                    raise OSError("git cat-file stopped responding")
+                if len(header) != 3:  # "<rev> missing" / "<rev> ambiguous"
+                    return None
+                if len(content) != int(size) or trailer != b"\n":
+                    raise OSError("git cat-file output was cut short")
+                return object_id.decode(), object_type.decode(), content
+            except (OSError, ValueError):
+                self._close_cat_file()
+                return None
+    
+    def _close_cat_file(self):
+        proc, self._cat_file = self._cat_file, None
+        if proc is not None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
+    
+    def close(self):
+        """Stop the cat-file batch process"""
+        with self._cat_file_lock:
+            self._close_cat_file()
+    
+    def rev_parse(self, rev: str) -> Optional[str]:
+        """Resolve a revision to its full object id"""
+        found = self.read_object(rev)
+        if found:
+            return found[0]
+        result = self.run_git_command(["rev-parse", "--verify", "--quiet", rev])
+        return result["stdout"] if result["success"] else None
+    
+    def _head_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Cheap fingerprint of .git/HEAD; git rewrites it on every switch"""
+        try:
+            st = os.stat(self.repo_path / ".git" / "HEAD")
+        except OSError:  # e.g. a worktree, where .git is a file
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+    
+    def _remember_branch(self, signature: Optional[Tuple[int, int, int]], branch: str):
+        self._branch_cache = (signature, branch) if signature is not None else None
+    
     def get_current_branch(self) -> str:
-        """Get current branch name"""
+        """Get current branch name
+        
+        The answer is reused until .git/HEAD changes, so repeated lookups
+        cost a stat() rather than a git process.
+        """
+        signature = self._head_signature()
+        cached = self._branch_cache
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+        
+        if self._repo is not None:
+            try:
+                branch = "" if self._repo.head_is_detached else self._repo.head.shorthand
+            except pygit2.GitError:
+                branch = None
+            if branch is not None:
+                self._remember_branch(signature, branch)
+                return branch
+        
         result = self.run_git_command(["branch", "--show-current"])
-        return result["stdout"] if result["success"] else "unknown"
+        if not result["success"]:
+            return "unknown"
+        self._remember_branch(signature, result["stdout"])
+        return result["stdout"]
     
     def get_status(self) -> Dict[str, Any]:
         """Get git status information"""
-        result = self.run_git_command(["status", "--porcelain"])
-        if not result["success"]:
-            return {"success": False, "error": result.get("stderr", "Unknown error")}
-        
-        lines = result["stdout"].split("\n") if result["stdout"] else []
+        # --branch reports the branch on a leading "## " record, so no second
+        # git call is needed for it. -z gives NUL-terminated records with
+        # unquoted paths.
+        signature = self._head_signature()
+        branch = "unknown"
         modified = []
         untracked = []
         staged = []
         
-        for line in lines:
-            if not line.strip():
+        try:
+            # run() kills git if it doesn't finish in time, and reads stdout
+            # and stderr together so neither pipe can fill up and block it
+            result = subprocess.run(
+                ["git", "status", "--porcelain=v1", "-z", "--branch"],
+                cwd=self.repo_path,
+                capture_output=True,
+                timeout=30
+            )
+        except subprocess.TimeoutExpired:
+            return {"success": False, "error": "Command timeout"}
+        except OSError as e:
+            return {"success": False, "error": str(e)}
+        
+        if result.returncode != 0:
+            return {"success": False, "error": _decode(result.stderr.strip())}
+        
+        # Status codes are compared as bytes; only the file names that are
+        # kept get decoded
+        rename_source = False
+        for record in result.stdout.split(b"\0"):
+            if rename_source:  # original path of a rename/copy
+                rename_source = False
+                continue
+            if record.startswith(b"## "):
+                branch = self._parse_branch_line(os.fsdecode(record[3:]))
                 continue
-            status = line[:2]
-            filename = line[3:]
+            if len(record) < 4:
+                continue
+            index, worktree = record[0], record[1]
+            rename_source = index in _RENAME_CODES or worktree in _RENAME_CODES
             
-            if status[0] in "MADRC":  # Staged changes
-                staged.append(filename)
-            if status[1] in "MD":     # Modified
-                modified.append(filename)
-            if status == "??":        # Untracked
-                untracked.append(filename)
+            if index in _STAGED_CODES:      # Staged changes
+                staged.append(os.fsdecode(record[3:]))
+            if worktree in _MODIFIED_CODES:  # Modified
+                modified.append(os.fsdecode(record[3:]))
+            if index == worktree == _UNTRACKED_CODE:  # Untracked ("??")
+                untracked.append(os.fsdecode(record[3:]))
         
+        if branch != "unknown":
+            self._remember_branch(signature, branch)
         return {
             "success": True,
-            "branch": self.get_current_branch(),
+            "branch": branch,
             "modified": modified,
             "untracked": untracked,
             "staged": staged,
             "clean": len(modified) == 0 and len(untracked) == 0 and len(staged) == 0
         }
     
+    @staticmethod
+    def _parse_branch_line(header: str) -> str:
+        """Branch name from a `git status --branch` header, "" when detached"""
+        for prefix in ("No commits yet on ", "Initial commit on "):
+            if header.startswith(prefix):
+                return header[len(prefix):]
+        if header.startswith("HEAD (no branch)"):
+            return ""
+        # "<branch>...<upstream> [ahead N]"; ref names cannot contain ".."
+        return header.split("...", 1)[0].split(" ", 1)[0]
+    
     def create_branch(self, branch_name: str, checkout: bool = True) -> Dict[str, Any]:
         """Create a new branch"""
         # Check if branch already exists
@@ -177,8 +441,8 @@ class GitManager:
         
         if result["success"]:
             # Get commit hash
-            hash_result = self.run_git_command(["rev-parse", "HEAD"])
-            commit_hash = hash_result["stdout"][:7] if hash_result["success"] else "unknown"
+            head = self.rev_parse("HEAD")
+            commit_hash = head[:7] if head else "unknown"
             
             return {
                 "success": True,
@@ -225,32 +489,140 @@ class GitManager:
     
     def get_remote_url(self, remote: str = "origin") -> str:
         """Get remote URL"""
+        if self._repo is not None:
+            try:
+                return self._repo.remotes[remote].url or ""
+            except (KeyError, ValueError, pygit2.GitError):
+                pass
         result = self.run_git_command(["remote", "get-url", remote])
         return result["stdout"] if result["success"] else ""
     
     def get_commit_log(self, count: int = 5) -> List[Dict[str, str]]:
-        """Get recent commit log"""
+        """Get recent commit log
+        
+        Commits are read through pygit2 or the cat-file batch process, newest
+        commit date first like `git log`; `git log` itself is the fallback.
+        """
+        commits = self._walk_commit_log(count)
+        if commits is not None:
+            return commits
+        
+        # NUL-separated fields, so "|" in a name or subject parses correctly
         result = self.run_git_command([
-            "log", f"-{count}", "--pretty=format:%h|%an|%ad|%s", "--date=short"
+            "log", f"-{count}", "--pretty=format:%h%x00%an%x00%ad%x00%s", "--date=short"
         ])
         
         if not result["success"]:
             return []
         
-        commits = []
-        for line in result["stdout"].split("\n"):
-            if "|" in line:
-                parts = line.split("|", 3)
-                if len(parts) == 4:
-                    commits.append({
-                        "hash": parts[0],
-                        "author": parts[1],
-                        "date": parts[2],
-                        "message": parts[3]
-                    })
+        return [match.groupdict() for match in _LOG_RECORD.finditer(result["stdout"])]
+    
+    def _walk_commit_log(self, count: int) -> Optional[List[Dict[str, str]]]:
+        """The log read commit by commit, or None to fall back to `git log`"""
+        if self._repo is not None:
+            return self._walk_commit_log_pygit2(count)
+        
+        head = self.read_object("HEAD")
+        if head is None or head[1] != "commit":
+            return None
+        info = self._parse_commit(head[2])
+        if info is None:
+            return None
         
+        commits = []
+        seen = {head[0]}
+        # Max-heap on committer time, as git's default revision walk; each
+        # entry carries its commit already parsed
+        queue = [(0, 0, head[0], info)]
+        order = 1
+        while queue and len(commits) < count:
+            _, _, object_id, info = heapq.heappop(queue)
+            commits.append({
+                "hash": object_id[:7],
+                "author": info["author"],
+                "date": info["date"],
+                "message": info["subject"]
+            })
+            for parent_id in info["parents"]:
+                if parent_id in seen:
+                    continue
+                seen.add(parent_id)
+                parent = self.read_object(parent_id)
+                if parent is None:
+                    return None
+                parent_info = self._parse_commit(parent[2])
+                if parent_info is None:
+                    return None
+                heapq.heappush(queue, (-parent_info["commit_time"], order, parent_id, parent_info))
+                order += 1
+        return commits
+    
+    def _walk_commit_log_pygit2(self, count: int) -> Optional[List[Dict[str, str]]]:
+        """The log through libgit2's revision walk, newest commit time first"""
+        commits = []
+        try:
+            for commit in self._repo.walk(self._repo.head.target, pygit2.GIT_SORT_TIME):
+                if len(commits) == count:
+                    break
+                author = commit.author
+                tz = timezone(timedelta(minutes=author.offset))
+                # %s is the first paragraph of the message folded onto one line
+                subject = commit.message.lstrip("\n").split("\n\n", 1)[0]
+                commits.append({
+                    "hash": str(commit.id)[:7],
+                    "author": author.name,
+                    "date": datetime.fromtimestamp(author.time, tz).strftime("%Y-%m-%d"),
+                    "message": " ".join(subject.split("\n")).strip()
+                })
+        except (KeyError, ValueError, LookupError, OverflowError, pygit2.GitError):
+            return None
         return commits
     
+    @staticmethod
+    def _parse_commit(content: bytes) -> Optional[Dict[str, Any]]:
+        """Pick the `git log --pretty=%an|%ad|%s --date=short` fields out of a raw commit
+        
+        Returns None for a commit git would show but this parser can't,
+        such as one with a malformed author or committer line.
+        """
+        headers, _, message = content.partition(b"\n\n")
+        info = {"parents": [], "author": "", "date": "", "subject": "", "commit_time": 0}
+        author = b""
+        encoding = "utf-8"
+        try:
+            for line in headers.split(b"\n"):
+                key, _, value = line.partition(b" ")
+                if key == b"parent":
+                    info["parents"].append(value.decode("ascii"))
+                elif key == b"encoding":
+                    encoding = value.decode("ascii")
+                elif key in (b"author", b"committer"):
+                    # "Name <email> <epoch> <+hhmm>"
+                    name, _, stamp = value.rpartition(b"> ")
+                    epoch, _, offset = stamp.partition(b" ")
+                    if key == b"committer":
+                        info["commit_time"] = int(epoch)
+                        continue
+                    author = name.partition(b" <")[0]
+                    if len(offset) != 5 or offset[:1] not in b"+-":
+                        return None
+                    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+                    tz = timezone(timedelta(minutes=-minutes if offset[:1] == b"-" else minutes))
+                    info["date"] = datetime.fromtimestamp(int(epoch), tz).strftime("%Y-%m-%d")
+            # %s is the first paragraph of the message folded onto one line
+            subject = message.lstrip(b"\n").split(b"\n\n", 1)[0]
+            subject = b" ".join(subject.split(b"\n")).strip()
+            # git log re-encodes messages from their declared encoding to UTF-8
+            try:
+                info["author"] = author.decode(encoding, "replace")
+                info["subject"] = subject.decode(encoding, "replace")
+            except LookupError:
+                info["author"] = author.decode("utf-8", "replace")
+                info["subject"] = subject.decode("utf-8", "replace")
+        except (ValueError, OverflowError, OSError):
+            return None
+        return info
+    
     def automated_commit_push_workflow(self, 
                                      files: List[str] = None,
                                      commit_message: str = None,
@@ -266,39 +638,74 @@ class GitManager:
         
         results.append(f"📊 Status: {len(status['modified'])} modified, {len(status['untracked'])} untracked, {len(status['staged'])} staged")
         
-        # Create branch if specified
+        # Branch, add, commit, resolve HEAD and push run as one shell
+        # script; a marker line before each step tells where it stopped
+        steps = []
         if branch_name and branch_name != status["branch"]:
-            branch_result = self.create_branch(branch_name)
-            results.append(branch_result["message"])
-            if not branch_result["success"]:
-                return {"success": False, "results": results, "error": "Branch creation failed"}
-        
-        # Add files
+            steps.append(("branch", f"git checkout -b {shlex.quote(branch_name)}"))
         if status["modified"] or status["untracked"] or files:
-            add_result = self.add_files(files)
-            results.append(add_result["message"])
-            if not add_result["success"]:
-                return {"success": False, "results": results, "error": "File add failed"}
+            if files is None:
+                steps.append(("add", "git add ."))
+            else:
+                steps.append(("add", "git add -- " + " ".join(shlex.quote(f) for f in files)))
         
-        # Commit
         if not commit_message:
             commit_message = f"Automated commit by A2A agent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        commit_command = f"git commit -m {shlex.quote(commit_message)}"
+        if author:
+            commit_command += f" --author {shlex.quote(author)}"
+        steps.append(("commit", commit_command))
+        steps.append(("rev-parse", "git rev-parse HEAD"))
         
-        commit_result = self.commit(commit_message, author)
-        results.append(commit_result["message"])
-        if not commit_result["success"]:
-            return {"success": False, "results": results, "error": "Commit failed"}
+        push_branch = shlex.quote(branch_name or status["branch"])
+        steps.append(("push", (
+            f"{{ git push origin {push_branch} || "
+            f"{{ echo {WORKFLOW_STEP_MARKER}upstream && git push --set-upstream origin {push_branch}; }}; }}"
+        )))
         
-        # Push
-        push_result = self.push_branch(branch_name or status["branch"])
-        results.append(push_result["message"])
-        if not push_result["success"]:
-            return {"success": False, "results": results, "error": "Push failed"}
+        script = " && ".join(f"echo {WORKFLOW_STEP_MARKER}{name} && {command}" for name, command in steps)
+        result = self.run_git_script(script)
+        
+        step = None
+        completed = []
+        commit_hash = "unknown"
+        for line in result["stdout"].split("\n"):
+            if line.startswith(WORKFLOW_STEP_MARKER):
+                if step is not None and step != "push":
+                    completed.append(step)
+                step = line[len(WORKFLOW_STEP_MARKER):]
+            elif step == "rev-parse" and line:
+                commit_hash = line[:7]
+        if result["success"]:
+            completed.append(step)
+        
+        branch = branch_name or status["branch"]
+        messages = {
+            "branch": f"✅ Branch '{branch_name}' created and checked out",
+            "add": "✅ Files added to staging area",
+            "commit": f"✅ Commit created: {commit_hash}",
+            "push": f"✅ Branch '{branch}' pushed to origin",
+            "upstream": f"✅ Branch '{branch}' pushed to origin (upstream set)",
+        }
+        results.extend(messages[name] for name in completed if name != "rev-parse")
+        
+        if not result["success"]:
+            failures = {
+                "branch": (f"❌ Failed to create branch '{branch_name}'", "Branch creation failed"),
+                "add": ("❌ Failed to add files", "File add failed"),
+                "commit": ("❌ Commit failed", "Commit failed"),
+                "rev-parse": ("❌ Commit failed", "Commit failed"),
+                "push": (f"❌ Failed to push branch '{branch}'", "Push failed"),
+                "upstream": (f"❌ Failed to push branch '{branch}'", "Push failed"),
+            }
+            message, error = failures.get(step, ("❌ Git workflow failed", result.get("error", "Git workflow failed")))
+            results.append(message)
+            return {"success": False, "results": results, "error": error}
         
         return {
             "success": True,
             "results": results,
-            "commit_hash": commit_result.get("commit_hash"),
+            "commit_hash": commit_hash,
             "branch": branch_name or status["branch"],
             "message": "✅ Automated workflow completed successfully"
         }
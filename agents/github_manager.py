@@ -5,15 +5,41 @@ Handles authentication, API calls, and GitHub operations
 """
 
 import requests
+import hashlib
 import json
 import os
+import threading
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional, Any, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Pages fetched at once when listing every page of a collection
+PAGE_FETCH_WORKERS = 8
+PER_PAGE_MAX = 100
+# Where command-line tools keep ETag-cached responses between runs
+ETAG_CACHE_FILE = Path.home() / ".a2a" / "gh_etag_cache.json"
 
 class GitHubManager:
-    def __init__(self, token: Optional[str] = None, repo_owner: str = "dvanosdol88", repo_name: str = "a2a-system"):
-        """Initialize GitHub API manager"""
+    def __init__(self, token: Optional[str] = None, repo_owner: str = "dvanosdol88", repo_name: str = "a2a-system",
+                 etag_cache_file: Optional[Path] = None):
+        """Initialize GitHub API manager
+        
+        With etag_cache_file, cached read responses are kept on disk so
+        conditional requests also pay off across runs.
+        """
         self.token = token or os.getenv("GITHUB_TOKEN")
         self.repo_owner = repo_owner
         self.repo_name = repo_name
@@ -22,25 +48,72 @@ class GitHubManager:
         
         if not self.token:
             print("⚠️  WARNING: No GitHub token provided. Set GITHUB_TOKEN environment variable.")
-    
-    def _headers(self) -> Dict[str, str]:
-        """Get request headers with authentication"""
-        headers = {
+        
+        # Token and User-Agent never change after construction
+        self._headers_cached = MappingProxyType({
             "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "A2A-System/1.0"
-        }
-        if self.token:
-            headers["Authorization"] = f"token {self.token}"
-        return headers
+            "User-Agent": "A2A-System/1.0",
+            **({"Authorization": f"token {self.token}"} if self.token else {})
+        })
+        
+        # One keep-alive session for every API call, so requests reuse the
+        # TLS connection; idempotent requests retry on transient 5xx
+        self._session = requests.Session()
+        self._session.headers.update(self._headers())
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                        max_retries=Retry(total=3, backoff_factor=0.2,
+                                          status_forcelist=[502, 503, 504])),
+        )
+        
+        # Request URL -> (ETag, parsed body) of the last 200 from a read API
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
+        self._etag_cache_file = etag_cache_file
+        self._etag_cache_lock = threading.Lock()
+        # Responses cached for one token are not reused for another
+        self._token_id = hashlib.sha256((self.token or "").encode()).hexdigest()[:16]
+        if etag_cache_file:
+            self._load_etag_cache()
+    
+    def _load_etag_cache(self):
+        try:
+            saved = loads(self._etag_cache_file.read_bytes())
+        except (OSError, ValueError):
+            return
+        if saved.get("token") == self._token_id:
+            self._etag_cache = {url: tuple(entry) for url, entry in saved.get("entries", {}).items()}
     
-    def _make_request(self, method: str, url: str, data: Optional[Dict] = None) -> requests.Response:
+    def _save_etag_cache(self):
+        data = json.dumps({"token": self._token_id, "entries": self._etag_cache}).encode()
+        try:
+            # Cached bodies come from authenticated requests (user, private
+            # repositories), so only the owner may read them
+            self._etag_cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_file = self._etag_cache_file.with_suffix(".tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                os.fchmod(f.fileno(), 0o600)  # in case an older tmp file was left behind
+                f.write(data)
+            os.replace(tmp_file, self._etag_cache_file)
+        except OSError as e:
+            print(f"⚠️  Could not save GitHub ETag cache: {e}")
+    
+    def _headers(self) -> Mapping[str, str]:
+        """Get request headers with authentication (read-only, built once)"""
+        return self._headers_cached
+    
+    def _make_request(self, method: str, url: str, data: Optional[Dict] = None,
+                      params: Optional[Dict] = None,
+                      headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """Make authenticated GitHub API request"""
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=self._headers(),
                 json=data,
+                params=params,
+                headers=headers,
                 timeout=30
             )
             return response
@@ -48,12 +121,65 @@ class GitHubManager:
             print(f"❌ GitHub API request failed: {e}")
             raise
     
+    def _get_json(self, url: str, params: Optional[Dict] = None) -> Tuple[int, Any]:
+        """Conditional GET of a JSON resource
+        
+        Sends the ETag of the last successful response as If-None-Match;
+        a 304 (which does not count against the rate limit) answers with
+        the cached body. Returns (status code, parsed body or None).
+        """
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        cached = self._etag_cache.get(key)
+        response = self._make_request(
+            "GET", url, params=params,
+            headers={"If-None-Match": cached[0]} if cached else None
+        )
+        if response.status_code == 304 and cached:
+            return 200, cached[1]
+        if response.status_code != 200:
+            return response.status_code, None
+        body = loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etag_cache_lock:
+                self._etag_cache[key] = (etag, body)
+                if self._etag_cache_file:
+                    self._save_etag_cache()
+        return 200, body
+    
+    def _get_all_pages(self, url: str, params: Dict[str, Any]) -> Tuple[requests.Response, List[Any]]:
+        """GET every page of a list endpoint
+        
+        The first page's Link header gives the last page number; the rest
+        are then fetched concurrently over the shared session. Returns the
+        first response (for error reporting) and the merged items, which
+        are empty unless every page succeeded.
+        """
+        params = {**params, "per_page": PER_PAGE_MAX}
+        first = self._make_request("GET", url, params={**params, "page": 1})
+        if first.status_code != 200:
+            return first, []
+        items = loads(first.content)
+        
+        last_url = first.links.get("last", {}).get("url")
+        last_page = int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0]) if last_url else 1
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, last_page - 1)) as pool:
+                pages = list(pool.map(
+                    lambda page: self._make_request("GET", url, params={**params, "page": page}),
+                    range(2, last_page + 1)
+                ))
+            for page in pages:
+                if page.status_code != 200:
+                    return page, []
+                items.extend(loads(page.content))
+        return first, items
+    
     def test_authentication(self) -> Dict[str, Any]:
         """Test GitHub API authentication"""
         try:
-            response = self._make_request("GET", f"{self.base_url}/user")
-            if response.status_code == 200:
-                user_data = response.json()
+            status_code, user_data = self._get_json(f"{self.base_url}/user")
+            if status_code == 200:
                 return {
                     "success": True,
                     "user": user_data.get("login"),
@@ -63,8 +189,8 @@ class GitHubManager:
             else:
                 return {
                     "success": False,
-                    "status_code": response.status_code,
-                    "message": f"❌ Authentication failed: {response.status_code}"
+                    "status_code": status_code,
+                    "message": f"❌ Authentication failed: {status_code}"
                 }
         except Exception as e:
             return {
@@ -73,12 +199,22 @@ class GitHubManager:
                 "message": f"❌ Authentication error: {str(e)}"
             }
     
+    def check_access(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run test_authentication and get_repo_info concurrently
+        
+        The two probes are independent, so checking a token costs one
+        round trip instead of two. Returns (auth_result, repo_result).
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            repo_future = pool.submit(self.get_repo_info)
+            auth_result = self.test_authentication()
+            return auth_result, repo_future.result()
+    
     def get_repo_info(self) -> Dict[str, Any]:
         """Get repository information"""
         try:
-            response = self._make_request("GET", self.repo_url)
-            if response.status_code == 200:
-                repo_data = response.json()
+            status_code, repo_data = self._get_json(self.repo_url)
+            if status_code == 200:
                 return {
                     "success": True,
                     "name": repo_data.get("name"),
@@ -91,8 +227,8 @@ class GitHubManager:
             else:
                 return {
                     "success": False,
-                    "status_code": response.status_code,
-                    "message": f"❌ Repository access failed: {response.status_code}"
+                    "status_code": status_code,
+                    "message": f"❌ Repository access failed: {status_code}"
                 }
         except Exception as e:
             return {
@@ -115,7 +251,7 @@ class GitHubManager:
         try:
             response = self._make_request("POST", f"{self.repo_url}/issues", data)
             if response.status_code == 201:
-                issue_data = response.json()
+                issue_data = loads(response.content)
                 return {
                     "success": True,
                     "issue_number": issue_data.get("number"),
@@ -147,7 +283,7 @@ class GitHubManager:
         try:
             response = self._make_request("POST", f"{self.repo_url}/pulls", data)
             if response.status_code == 201:
-                pr_data = response.json()
+                pr_data = loads(response.content)
                 return {
                     "success": True,
                     "pr_number": pr_data.get("number"),
@@ -174,7 +310,7 @@ class GitHubManager:
         try:
             response = self._make_request("POST", f"{self.repo_url}/issues/{issue_number}/comments", data)
             if response.status_code == 201:
-                comment_data = response.json()
+                comment_data = loads(response.content)
                 return {
                     "success": True,
                     "comment_id": comment_data.get("id"),
@@ -194,21 +330,23 @@ class GitHubManager:
                 "message": f"❌ Comment error: {str(e)}"
             }
     
-    def get_issues(self, state: str = "open", labels: str = None) -> Dict[str, Any]:
-        """Get repository issues"""
+    def get_issues(self, state: str = "open", labels: str = None, all_pages: bool = False) -> Dict[str, Any]:
+        """Get repository issues
+        
+        Only the first page is returned unless all_pages is set.
+        """
         params = {"state": state}
         if labels:
             params["labels"] = labels
         
         try:
             url = f"{self.repo_url}/issues"
-            if params:
-                param_str = "&".join([f"{k}={v}" for k, v in params.items()])
-                url += f"?{param_str}"
-            
-            response = self._make_request("GET", url)
-            if response.status_code == 200:
-                issues = response.json()
+            if all_pages:
+                response, issues = self._get_all_pages(url, params)
+                status_code = response.status_code
+            else:
+                status_code, issues = self._get_json(url, params)
+            if status_code == 200:
                 return {
                     "success": True,
                     "count": len(issues),
@@ -218,8 +356,8 @@ class GitHubManager:
             else:
                 return {
                     "success": False,
-                    "status_code": response.status_code,
-                    "message": f"❌ Issues fetch failed: {response.status_code}"
+                    "status_code": status_code,
+                    "message": f"❌ Issues fetch failed: {status_code}"
                 }
         except Exception as e:
             return {
@@ -228,12 +366,18 @@ class GitHubManager:
                 "message": f"❌ Issues fetch error: {str(e)}"
             }
     
-    def get_pull_requests(self, state: str = "open") -> Dict[str, Any]:
-        """Get repository pull requests"""
+    def get_pull_requests(self, state: str = "open", all_pages: bool = False) -> Dict[str, Any]:
+        """Get repository pull requests
+        
+        Only the first page is returned unless all_pages is set.
+        """
         try:
-            response = self._make_request("GET", f"{self.repo_url}/pulls?state={state}")
-            if response.status_code == 200:
-                prs = response.json()
+            if all_pages:
+                response, prs = self._get_all_pages(f"{self.repo_url}/pulls", {"state": state})
+                status_code = response.status_code
+            else:
+                status_code, prs = self._get_json(f"{self.repo_url}/pulls", {"state": state})
+            if status_code == 200:
                 return {
                     "success": True,
                     "count": len(prs),
@@ -243,8 +387,8 @@ class GitHubManager:
             else:
                 return {
                     "success": False,
-                    "status_code": response.status_code,
-                    "message": f"❌ PRs fetch failed: {response.status_code}"
+                    "status_code": status_code,
+                    "message": f"❌ PRs fetch failed: {status_code}"
                 }
         except Exception as e:
             return {
@@ -5,17 +5,56 @@ Polls for assigned tasks and provides automated responses
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from task_router import KeywordRouter
+
+# The server holds a long-poll for up to LONG_POLL_TIMEOUT seconds
+LONG_POLL_TIMEOUT = 30
+LONG_POLL_HTTP_TIMEOUT = (5, LONG_POLL_TIMEOUT + 5)  # (connect, read)
+
+# Response categories, in priority order
+RESPONSE_ROUTER = KeywordRouter([
+    ("api", [("api", "server")]),
+    ("task_queue", [("task",), ("queue",)]),
+    ("monitoring", [("monitoring", "dashboard")]),
+    ("communication", [("communication", "message")]),
+    ("security", [("security",)]),
+    ("health", [("test", "health")]),
+    ("coordination", [("coordination", "orchestration")]),
+])
+RESPONSES = {
+    "api": "🌐 JULES: API services operational. Server endpoints ready for coordination.",
+    "task_queue": "📋 JULES: Task queue management active. Routing capabilities engaged.",
+    "monitoring": "📊 JULES: Monitoring services active. Data pipeline operational.",
+    "communication": "💬 JULES: Communication relay established. Message routing protocols active.",
+    "security": "🔐 JULES: Security protocols acknowledged. Coordinating with agents for secure operations.",
+    "health": "✅ JULES: System health confirmed. All API endpoints responding normally.",
+    "coordination": "🎯 JULES: Coordination hub active. Agent communication channels established.",
+}
 
 class JulesAgent:
     def __init__(self, api_base="http://127.0.0.1:5006", agent_id="jules"):
         self.api_base = api_base
         self.agent_id = agent_id
         self.running = False
-        self.poll_interval = 12  # seconds (slightly different from CODEX)
+        self.poll_interval = 12  # seconds (slightly different from CODEX), only used without long-poll support
+        self.long_poll = True
+        # Runs per-task acknowledge/complete calls side by side on servers
+        # without the batch endpoint
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="jules-task")
+        # One keep-alive session for every API call, with a connection per
+        # task worker
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+        # Last pending-task list and its ETag; the server answers 304 while
+        # the list is unchanged and the cached copy is reused
+        self._tasks = []
+        self._tasks_etag = None
         
     def log(self, message):
         """Log with timestamp"""
@@ -25,7 +64,7 @@ class JulesAgent:
     def get_pending_tasks(self):
         """Get pending tasks assigned to this agent"""
         try:
-            response = requests.get(f"{self.api_base}/agent/{self.agent_id}/tasks", timeout=5)
+            response = self._http.get(f"{self.api_base}/agent/{self.agent_id}/tasks", timeout=5)
             if response.status_code == 200:
                 return response.json()
             return []
@@ -33,10 +72,33 @@ class JulesAgent:
             self.log(f"Error fetching tasks: {e}")
             return []
     
+    def wait_for_tasks(self):
+        """Long-poll for pending tasks
+        
+        Returns as soon as tasks are assigned (or [] after LONG_POLL_TIMEOUT),
+        or None if the server has no long-poll endpoint. Transport errors
+        propagate so the caller can back off.
+        """
+        headers = {"If-None-Match": self._tasks_etag} if self._tasks_etag else None
+        response = self._http.get(
+            f"{self.api_base}/agent/{self.agent_id}/tasks/wait",
+            params={"timeout": LONG_POLL_TIMEOUT},
+            headers=headers,
+            timeout=LONG_POLL_HTTP_TIMEOUT
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        if response.status_code == 304:
+            return self._tasks
+        self._tasks = response.json()
+        self._tasks_etag = response.headers.get("ETag")
+        return self._tasks
+    
     def acknowledge_task(self, task_id):
         """Acknowledge receiving a task"""
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.api_base}/agent/{self.agent_id}/tasks/{task_id}/acknowledge",
                 timeout=5
             )
@@ -48,7 +110,7 @@ class JulesAgent:
     def complete_task(self, task_id, response_text):
         """Mark task as completed with response"""
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.api_base}/agent/{self.agent_id}/tasks/{task_id}/complete",
                 json={"response": response_text},
                 timeout=5
@@ -58,9 +120,36 @@ class JulesAgent:
             self.log(f"Error completing task {task_id}: {e}")
             return False
     
+    def complete_tasks(self, responses):
+        """Acknowledge and complete several tasks in one request
+        
+        responses maps task ID to response text. Returns the completed IDs,
+        or None if the server has no batch endpoint.
+        """
+        try:
+            response = self._http.post(
+                f"{self.api_base}/agent/{self.agent_id}/tasks/batch",
+                json={"completions": [{"id": task_id, "response": text} for task_id, text in responses.items()]},
+                timeout=5
+            )
+            if response.status_code == 404:
+                return None
+            if response.status_code == 200:
+                return set(response.json()["completed"])
+            return set()
+        except Exception as e:
+            self.log(f"Error completing tasks {list(responses)}: {e}")
+            return set()
+    
+    def generate_response(self, task):
+        """Generate the response text for a task"""
+        route = RESPONSE_ROUTER.route(task["task"].lower())
+        if route:
+            return RESPONSES[route]
+        return f"⚡ JULES: Task received and queued. Processing: {task['task'][:30]}..."
+    
     def process_task(self, task):
         """Process a task and generate appropriate response"""
-        task_text = task["task"].lower()
         task_id = task["id"]
         
         # Acknowledge the task first
@@ -68,24 +157,7 @@ class JulesAgent:
             self.log(f"Acknowledged task {task_id}: {task['task'][:50]}...")
         
         # Generate response based on task content
-        response = "⚡ JULES acknowledged and processing..."
-        
-        if "api" in task_text or "server" in task_text:
-            response = "🌐 JULES: API services operational. Server endpoints ready for coordination."
-        elif "task" in task_text and "queue" in task_text:
-            response = "📋 JULES: Task queue management active. Routing capabilities engaged."
-        elif "monitoring" in task_text or "dashboard" in task_text:
-            response = "📊 JULES: Monitoring services active. Data pipeline operational."
-        elif "communication" in task_text or "message" in task_text:
-            response = "💬 JULES: Communication relay established. Message routing protocols active."
-        elif "security" in task_text:
-            response = "🔐 JULES: Security protocols acknowledged. Coordinating with agents for secure operations."
-        elif "test" in task_text or "health" in task_text:
-            response = "✅ JULES: System health confirmed. All API endpoints responding normally."
-        elif "coordination" in task_text or "orchestration" in task_text:
-            response = "🎯 JULES: Coordination hub active. Agent communication channels established."
-        else:
-            response = f"⚡ JULES: Task received and queued. Processing: {task['task'][:30]}..."
+        response = self.generate_response(task)
         
         # Complete the task
         if self.complete_task(task_id, response):
@@ -93,23 +165,48 @@ class JulesAgent:
             return True
         return False
     
+    def process_tasks(self, tasks):
+        """Answer one poll's worth of tasks; returns how many were completed
+        
+        All responses go back in a single acknowledge+complete request,
+        falling back to per-task calls on servers without it.
+        """
+        responses = {task["id"]: self.generate_response(task) for task in tasks}
+        completed = self.complete_tasks(responses)
+        if completed is None:
+            return sum(self._pool.map(self.process_task, tasks))
+        
+        for task_id in completed:
+            self.log(f"Completed task {task_id}")
+        return len(completed)
+    
     def start(self):
         """Start the agent polling loop"""
         self.running = True
         self.log("JULES Agent starting up...")
-        self.log(f"Polling {self.api_base} every {self.poll_interval} seconds")
+        self.log(f"Long-polling {self.api_base} for tasks")
         
         while self.running:
             try:
                 # Get pending tasks
-                tasks = self.get_pending_tasks()
+                if self.long_poll:
+                    tasks = self.wait_for_tasks()
+                    if tasks is None:
+                        self.log("Server has no long-poll endpoint, falling back to polling")
+                        self.long_poll = False
+                        continue
+                else:
+                    tasks = self.get_pending_tasks()
                 
+                completed = 0
                 if tasks:
                     self.log(f"Found {len(tasks)} pending tasks")
-                    for task in tasks:
-                        self.process_task(task)
+                    completed = self.process_tasks(tasks)
                 
-                time.sleep(self.poll_interval)
+                # A long-poll returns straight away while tasks stay
+                # pending, so only skip the wait when work got done
+                if not self.long_poll or (tasks and not completed):
+                    time.sleep(self.poll_interval)
                 
             except KeyboardInterrupt:
                 self.log("Shutting down...")
@@ -6,7 +6,6 @@ Non-interactive version for command line
 
 import os
 import sys
-from github_manager import GitHubManager
 
 def setup_token_from_args():
     """Set up GitHub token from command line argument"""
@@ -31,18 +30,18 @@ def setup_token_from_args():
     
     # Test the token
     print("🧪 Testing token...")
+    # Imported here so the usage message doesn't wait for requests to load
+    from github_manager import GitHubManager
     github = GitHubManager(token)
     
-    # Test authentication
-    auth_result = github.test_authentication()
+    # Test authentication and repository access side by side
+    auth_result, repo_result = github.check_access()
     print(f"Auth: {auth_result['message']}")
     
     if not auth_result["success"]:
         print("❌ Token authentication failed")
         return False
     
-    # Test repository access
-    repo_result = github.get_repo_info()
     print(f"Repo: {repo_result['message']}")
     
     if not repo_result["success"]:
@@ -7,7 +7,6 @@ Helps configure GitHub Personal Access Tokens
 import os
 import getpass
 from pathlib import Path
-from github_manager import GitHubManager
 
 def setup_github_token():
     """Interactive GitHub token setup"""
@@ -20,6 +19,9 @@ def setup_github_token():
         print(f"✅ GITHUB_TOKEN already set: {current_token[:8]}...")
         test_existing = input("Test existing token? (y/n): ").lower().strip()
         if test_existing == 'y':
+            # github_manager loads requests, so it is only imported where a
+            # token actually gets tested
+            from github_manager import GitHubManager
             github = GitHubManager(current_token)
             auth_result = github.test_authentication()
             repo_result = github.get_repo_info()
@@ -58,6 +60,7 @@ def setup_github_token():
     
     # Test the token
     print("\n🧪 Testing token...")
+    from github_manager import GitHubManager
     github = GitHubManager(token)
     
     auth_result = github.test_authentication()
@@ -101,7 +104,10 @@ def verify_setup():
     """Verify GitHub setup is working"""
     print("\n🔍 Verifying A2A GitHub setup...")
     
-    github = GitHubManager()
+    # Repeat runs send conditional requests; unchanged answers come back
+    # as 304s that don't count against the rate limit
+    from github_manager import ETAG_CACHE_FILE, GitHubManager
+    github = GitHubManager(etag_cache_file=ETAG_CACHE_FILE)
     
     # Test auth
     auth_result = github.test_authentication()
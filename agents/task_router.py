@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Task Router for A2A Agents
+Matches task text against every routing keyword in a single pass
+"""
+
+import re
+from typing import Optional, Sequence, Set, Tuple
+
+# (route name, keyword groups): a route fires when every group has at least
+# one matching keyword. Routes are checked in the order given.
+Route = Tuple[str, Sequence[Sequence[str]]]
+
+
+class KeywordRouter:
+    def __init__(self, routes: Sequence[Route]):
+        """Compile all keywords of the routes into one pattern"""
+        self.routes = tuple(routes)
+        keywords = {keyword for _, groups in self.routes for group in groups for keyword in group}
+        # Longest first so a keyword wins over its own prefix at the same
+        # position; the lookahead lets matches overlap.
+        alternation = "|".join(
+            re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+        )
+        self._pattern = re.compile(f"(?=({alternation}))")
+        # Keywords matching at the same position are all prefixes of the
+        # longest one there, which is the only one the pattern reports
+        self._with_prefixes = {
+            keyword: frozenset(other for other in keywords if keyword.startswith(other))
+            for keyword in keywords
+        }
+
+    def matches(self, text_lower: str) -> Set[str]:
+        """Return every routing keyword found in the (lowercased) text"""
+        matched = set()
+        for match in self._pattern.finditer(text_lower):
+            matched |= self._with_prefixes[match.group(1)]
+        return matched
+
+    def route(self, text_lower: str) -> Optional[str]:
+        """Return the first route whose keyword groups all match, if any"""
+        matched = self.matches(text_lower)
+        if not matched:
+            return None
+        for name, groups in self.routes:
+            if all(matched.intersection(group) for group in groups):
+                return name
+        return None
@@ -4,13 +4,59 @@ Agent Health Monitoring System
 Tracks health status of all A2A agents
 """
 from flask import Flask, jsonify
-from datetime import datetime, timedelta
+from datetime import datetime
+import atexit
+from collections import Counter
+import enum
 import json
 import os
+import threading
+import time
 from pathlib import Path
+from redis.exceptions import RedisError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Seconds between writes of changed health data to disk
+HEALTH_FLUSH_INTERVAL = 1.0
+# Agents not seen for this many seconds are reported offline
+OFFLINE_AFTER = 300
+# Redis hash of agent id -> agent health JSON, shared by all workers
+HEALTH_KEY = "a2a:agent_health"
+
+class Status(enum.IntEnum):
+    """Agent status as kept in memory; JSON output uses the lowercase name"""
+    UNKNOWN = 0
+    OFFLINE = 1
+    HEALTHY = 2
+    WARNING = 3
+    CRITICAL = 4
+
+# Indexed by Status value
+_STATUS_NAMES = tuple(status.name.lower() for status in Status)
+_STATUS_BY_NAME = {name: Status(code) for code, name in enumerate(_STATUS_NAMES)}
+
+def _encode_agent(agent):
+    agent = {**agent, "status": _STATUS_NAMES[agent["status"]]}
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(agent, default=str)
+    return json.dumps(agent, default=str).encode()
+
+def _decode_agent(data):
+    agent = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    agent["status"] = _STATUS_BY_NAME.get(agent.get("status"), Status.UNKNOWN)
+    return agent
 
 class AgentHealthMonitor:
-    def __init__(self):
+    def __init__(self, redis_client=None):
+        """With a Redis client, health is kept in the HEALTH_KEY hash so every
+        worker sees the same data; the file is only written when Redis fails.
+        """
+        self.redis_client = redis_client
         self.base_dir = Path(__file__).parent.parent
         self.health_file = self.base_dir / "shared" / "agent_health.json"
         self.agents = {
@@ -19,7 +65,7 @@ class AgentHealthMonitor:
                 "type": "orchestrator",
                 "health_threshold": 30,  # Context health percentage
                 "last_seen": None,
-                "status": "unknown",
+                "status": Status.UNKNOWN,
                 "context_usage": 0,
                 "metrics": {}
             },
@@ -28,7 +74,7 @@ class AgentHealthMonitor:
                 "type": "api_coordinator",
                 "health_threshold": 90,  # Response time threshold
                 "last_seen": None,
-                "status": "unknown",
+                "status": Status.UNKNOWN,
                 "response_time": 0,
                 "metrics": {}
             },
@@ -37,7 +83,7 @@ class AgentHealthMonitor:
                 "type": "code_generator",
                 "health_threshold": 95,  # Success rate threshold
                 "last_seen": None,
-                "status": "unknown", 
+                "status": Status.UNKNOWN,
                 "success_rate": 100,
                 "metrics": {}
             },
@@ -46,12 +92,21 @@ class AgentHealthMonitor:
                 "type": "system_operator",
                 "health_threshold": 30,  # Context health percentage
                 "last_seen": None,
-                "status": "unknown",
+                "status": Status.UNKNOWN,
                 "context_usage": 0,
                 "metrics": {}
             }
         }
         self.load_health_data()
+        
+        # Updates only mark the data dirty; a background thread writes it out
+        # at most once per interval, and once more at exit
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_interval = HEALTH_FLUSH_INTERVAL
+        self._stop = threading.Event()
+        threading.Thread(target=self._flush_loop, name="health-flush", daemon=True).start()
+        atexit.register(self.close)
     
     def load_health_data(self):
         """Load saved health data"""
@@ -62,71 +117,157 @@ class AgentHealthMonitor:
                     for agent_id, data in saved_data.items():
                         if agent_id in self.agents:
                             self.agents[agent_id].update(data)
+                for agent in self.agents.values():
+                    if isinstance(agent["status"], str):
+                        agent["status"] = _STATUS_BY_NAME.get(agent["status"], Status.UNKNOWN)
+                    # Data saved before last_seen_epoch existed
+                    if agent["last_seen"] and "last_seen_epoch" not in agent:
+                        agent["last_seen_epoch"] = datetime.fromisoformat(
+                            agent["last_seen"].replace('Z', '+00:00')
+                        ).timestamp()
             except:
                 pass
     
     def save_health_data(self):
-        """Save health data to file"""
-        self.health_file.parent.mkdir(exist_ok=True)
-        with open(self.health_file, 'w') as f:
-            json.dump(self.agents, f, indent=2, default=str)
+        """Save health data to file
+        
+        Written to a temporary file and renamed over the old one, so readers
+        never see a partial file.
+        """
+        with self._lock:
+            self._dirty = False
+            agents = {
+                agent_id: {**agent, "status": _STATUS_NAMES[agent["status"]]}
+                for agent_id, agent in self.agents.items()
+            }
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(agents, default=str, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(agents, indent=2, default=str).encode()
+            self.health_file.parent.mkdir(exist_ok=True)
+            tmp_file = self.health_file.with_suffix(".tmp")
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.health_file)
+    
+    def _flush_loop(self):
+        while not self._stop.wait(self._flush_interval):
+            if self._dirty:
+                try:
+                    self.save_health_data()
+                except OSError as e:
+                    print(f"Warning: could not save agent health data: {e}")
+    
+    def close(self):
+        """Stop the flush thread and write any pending update"""
+        self._stop.set()
+        if self._dirty:
+            self.save_health_data()
     
     def update_agent_health(self, agent_id, health_data):
         """Update health status for an agent"""
         if agent_id not in self.agents:
             return False
         
-        agent = self.agents[agent_id]
+        if self.redis_client is not None:
+            try:
+                self._update_shared(agent_id, health_data)
+                return True
+            except RedisError as e:
+                print(f"Warning: could not update agent health in Redis: {e}")
+        
+        with self._lock:
+            self._apply_health_data(self.agents[agent_id], health_data)
+            self._dirty = True
+        return True
+    
+    def _update_shared(self, agent_id, health_data):
+        """Read, update and write back the agent's entry under WATCH
+
+        If another worker writes the hash in between, the transaction is
+        retried on its data instead of overwriting it.
+        """
+        def update(pipe):
+            saved = pipe.hget(HEALTH_KEY, agent_id)
+            agent = self.agents[agent_id]
+            agent = {**agent, "metrics": dict(agent.get("metrics", {}))}
+            if saved:
+                agent.update(_decode_agent(saved))
+            self._apply_health_data(agent, health_data)
+            pipe.multi()
+            pipe.hset(HEALTH_KEY, agent_id, _encode_agent(agent))
+            return agent
+        
+        agent = self.redis_client.transaction(update, HEALTH_KEY, value_from_callable=True)
+        with self._lock:
+            self.agents[agent_id].update(agent)
+    
+    def _refresh(self):
+        """Pick up health updates other workers wrote to Redis"""
+        if self.redis_client is None:
+            return
+        try:
+            saved = self.redis_client.hgetall(HEALTH_KEY)
+        except RedisError as e:
+            print(f"Warning: could not read agent health from Redis: {e}")
+            return
+        for agent_id, data in saved.items():
+            if isinstance(agent_id, bytes):
+                agent_id = agent_id.decode()
+            if agent_id in self.agents:
+                self.agents[agent_id].update(_decode_agent(data))
+    
+    def _apply_health_data(self, agent, health_data):
         agent["last_seen"] = datetime.utcnow().isoformat() + "Z"
+        # Kept alongside the ISO string so status checks need no parsing
+        agent["last_seen_epoch"] = time.time()
         
         # Update metrics based on agent type
         if "context_usage" in health_data:
             agent["context_usage"] = health_data["context_usage"]
             # Determine health based on context usage
             if agent["context_usage"] < 30:
-                agent["status"] = "healthy"
+                agent["status"] = Status.HEALTHY
             elif agent["context_usage"] < 70:
-                agent["status"] = "warning"
+                agent["status"] = Status.WARNING
             else:
-                agent["status"] = "critical"
+                agent["status"] = Status.CRITICAL
         
         if "response_time" in health_data:
             agent["response_time"] = health_data["response_time"]
-            agent["status"] = "healthy" if agent["response_time"] < 1000 else "warning"
+            agent["status"] = Status.HEALTHY if agent["response_time"] < 1000 else Status.WARNING
         
         if "success_rate" in health_data:
             agent["success_rate"] = health_data["success_rate"]
-            agent["status"] = "healthy" if agent["success_rate"] > 95 else "warning"
+            agent["status"] = Status.HEALTHY if agent["success_rate"] > 95 else Status.WARNING
         
         if "tasks_processed" in health_data:
             agent["metrics"]["tasks_processed"] = health_data.get("tasks_processed", 0)
-        
-        self.save_health_data()
-        return True
     
     def check_agent_status(self, agent_id):
         """Check if agent is responsive"""
+        self._refresh()
+        return _STATUS_NAMES[self._status_code(agent_id)]
+    
+    def _status_code(self, agent_id):
         if agent_id not in self.agents:
-            return "unknown"
+            return Status.UNKNOWN
         
         agent = self.agents[agent_id]
         if not agent["last_seen"]:
-            return "offline"
+            return Status.OFFLINE
         
         # Check if agent was seen in last 5 minutes
-        last_seen = datetime.fromisoformat(agent["last_seen"].replace('Z', '+00:00'))
-        time_since = datetime.utcnow() - last_seen.replace(tzinfo=None)
-        
-        if time_since > timedelta(minutes=5):
-            agent["status"] = "offline"
+        if time.time() - agent.get("last_seen_epoch", 0) > OFFLINE_AFTER:
+            agent["status"] = Status.OFFLINE
         
         return agent["status"]
     
     def get_all_health_status(self):
         """Get health status for all agents"""
+        self._refresh()
         health_report = {}
         for agent_id, agent in self.agents.items():
-            status = self.check_agent_status(agent_id)
+            status = _STATUS_NAMES[self._status_code(agent_id)]
             health_report[agent_id] = {
                 "name": agent["name"],
                 "type": agent["type"],
@@ -141,27 +282,23 @@ class AgentHealthMonitor:
     
     def get_health_summary(self):
         """Get a summary of system health"""
-        all_health = self.get_all_health_status()
-        
+        self._refresh()
+        counts = Counter(self._status_code(agent_id) for agent_id in self.agents)
         total_agents = len(self.agents)
-        healthy_agents = sum(1 for a in all_health.values() if a["status"] == "healthy")
-        warning_agents = sum(1 for a in all_health.values() if a["status"] == "warning")
-        critical_agents = sum(1 for a in all_health.values() if a["status"] == "critical")
-        offline_agents = sum(1 for a in all_health.values() if a["status"] in ["offline", "unknown"])
         
         return {
             "total_agents": total_agents,
-            "healthy": healthy_agents,
-            "warning": warning_agents,
-            "critical": critical_agents,
-            "offline": offline_agents,
-            "system_status": "healthy" if healthy_agents == total_agents else "degraded",
+            "healthy": counts[Status.HEALTHY],
+            "warning": counts[Status.WARNING],
+            "critical": counts[Status.CRITICAL],
+            "offline": counts[Status.OFFLINE] + counts[Status.UNKNOWN],
+            "system_status": "healthy" if counts[Status.HEALTHY] == total_agents else "degraded",
             "timestamp": datetime.utcnow().isoformat() + "Z"
         }
 
 # Flask endpoints for agent health
-def create_health_endpoints(app):
-    monitor = AgentHealthMonitor()
+def create_health_endpoints(app, redis_client=None):
+    monitor = AgentHealthMonitor(redis_client)
     
     @app.route("/api/agents/health")
     def get_agents_health():
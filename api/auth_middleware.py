@@ -1,14 +1,133 @@
 """Authentication and Rate Limiting Middleware for A2A System"""
 
+import atexit
+import hashlib
+import queue
+import threading
 import time
 import functools
-from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import OrderedDict
+from datetime import datetime
 from flask import request, jsonify, g
+from redis.exceptions import RedisError
 
 from config.settings import Config
 from database.db_manager import db
 
+# Settings read on every request, resolved once at import
+_AUTH_ENABLED = Config.ENABLE_AUTH
+_API_KEY_HEADER = Config.API_KEY_HEADER
+_RATE_LIMIT_ENABLED = Config.RATE_LIMIT_ENABLED
+_RATE_LIMIT_DEFAULT = Config.RATE_LIMIT_DEFAULT
+# Paths that skip authentication and rate limiting (health probes)
+_SKIP_PATHS = frozenset(('/health',))
+
+# Validated API keys are remembered this long, keyed by the key's SHA-256
+API_KEY_CACHE_TTL = 60
+API_KEY_CACHE_SIZE = 1024
+
+_api_key_cache = OrderedDict()  # digest -> (expires at, key info), LRU order
+_api_key_cache_lock = threading.Lock()
+
+
+def validate_api_key(api_key):
+    """db.validate_api_key, cached for API_KEY_CACHE_TTL seconds
+
+    Only valid keys are cached, and never in plain text.
+    """
+    digest = hashlib.sha256(api_key.encode()).digest()
+    now = time.monotonic()
+    with _api_key_cache_lock:
+        cached = _api_key_cache.get(digest)
+        if cached is not None and cached[0] > now:
+            _api_key_cache.move_to_end(digest)
+            return cached[1]
+    
+    key_info = db.validate_api_key(api_key)
+    if key_info:
+        with _api_key_cache_lock:
+            _api_key_cache[digest] = (now + API_KEY_CACHE_TTL, key_info)
+            _api_key_cache.move_to_end(digest)
+            if len(_api_key_cache) > API_KEY_CACHE_SIZE:
+                _api_key_cache.popitem(last=False)
+    return key_info
+
+
+def clear_api_key_cache():
+    """Forget cached keys, e.g. after revoking or rotating one"""
+    with _api_key_cache_lock:
+        _api_key_cache.clear()
+
+
+# Request logs are queued and written in batches by a background thread,
+# keeping the database insert off the request path. When the queue is full
+# new entries are dropped.
+REQUEST_LOG_QUEUE_SIZE = 10000
+REQUEST_LOG_BATCH_SIZE = 100
+REQUEST_LOG_FLUSH_INTERVAL = 0.1  # seconds a partial batch may wait
+
+# Rate limit buckets idle this long are full again and can be dropped
+RATE_LIMIT_BUCKET_IDLE = 300
+# Redis rate limit counters live a little past their one-minute window
+RATE_LIMIT_KEY_TTL = 70
+
+_log_queue = queue.Queue(maxsize=REQUEST_LOG_QUEUE_SIZE)
+_log_writer = None
+_log_writer_lock = threading.Lock()
+
+
+def _write_request_logs(batch):
+    # Rows are queued with an epoch time; formatting it happens here, off
+    # the request path
+    rows = [
+        row[:4] + (datetime.utcfromtimestamp(row[4]).isoformat(),) + row[5:]
+        for row in batch
+    ]
+    try:
+        db.log_requests_bulk(rows)
+    except Exception as e:
+        print(f"Warning: could not write {len(batch)} request logs: {e}")
+
+
+def _request_log_writer():
+    """Drain the log queue: up to a batch, or whatever came within the interval"""
+    while True:
+        batch = [_log_queue.get()]
+        deadline = time.monotonic() + REQUEST_LOG_FLUSH_INTERVAL
+        while len(batch) < REQUEST_LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _write_request_logs(batch)
+
+
+def start_request_log_writer():
+    """Start the background request log writer, once per process"""
+    global _log_writer
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = threading.Thread(
+                target=_request_log_writer, name="request-log-writer", daemon=True
+            )
+            _log_writer.start()
+            atexit.register(flush_request_logs)
+
+
+def flush_request_logs():
+    """Write every queued request log now"""
+    batch = []
+    while True:
+        try:
+            batch.append(_log_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _write_request_logs(batch)
+
 
 class AuthMiddleware:
     """Handles API authentication and authorization"""
@@ -25,22 +144,18 @@ class AuthMiddleware:
     
     def authenticate_request(self):
         """Authenticate incoming requests"""
-        # Skip auth for health check
-        if request.path == '/health':
-            return None
-        
-        # Skip auth if disabled
-        if not Config.ENABLE_AUTH:
+        # Skip auth for health check, or if disabled
+        if not _AUTH_ENABLED or request.path in _SKIP_PATHS:
             g.api_key_info = None
             return None
         
         # Get API key from header
-        api_key = request.headers.get(Config.API_KEY_HEADER)
+        api_key = request.headers.get(_API_KEY_HEADER)
         if not api_key:
             return jsonify({'error': 'API key required'}), 401
         
         # Validate API key
-        key_info = db.validate_api_key(api_key)
+        key_info = validate_api_key(api_key)
         if not key_info:
             return jsonify({'error': 'Invalid API key'}), 401
         
@@ -55,7 +170,7 @@ class AuthMiddleware:
         def decorator(f):
             @functools.wraps(f)
             def decorated_function(*args, **kwargs):
-                if not Config.ENABLE_AUTH:
+                if not _AUTH_ENABLED:
                     return f(*args, **kwargs)
                 
                 if not g.get('api_key_info'):
@@ -73,9 +188,16 @@ class AuthMiddleware:
 class RateLimiter:
     """Handles rate limiting for API endpoints"""
     
-    def __init__(self, app=None):
+    def __init__(self, app=None, redis_client=None):
         self.app = app
-        self.request_counts = defaultdict(list)
+        # With a Redis client, counts are shared by every worker process;
+        # the in-process buckets are used when it is unavailable
+        self.redis_client = redis_client
+        # Token bucket per identifier: [tokens left, monotonic time of last
+        # request]. A bucket holds `limit` tokens and refills at limit/minute.
+        self.buckets = {}
+        self._buckets_lock = threading.Lock()
+        self._next_sweep = time.monotonic() + RATE_LIMIT_BUCKET_IDLE
         if app:
             self.init_app(app)
     
@@ -84,59 +206,91 @@ class RateLimiter:
         self.app = app
         app.before_request(self.check_rate_limit)
         app.after_request(self.log_request)
+        start_request_log_writer()
     
     def check_rate_limit(self):
         """Check if request exceeds rate limit"""
-        if not Config.RATE_LIMIT_ENABLED:
-            return None
-        
-        # Skip rate limiting for health check
-        if request.path == '/health':
+        # Skip if disabled, and for health check
+        if not _RATE_LIMIT_ENABLED or request.path in _SKIP_PATHS:
             return None
         
         # Get identifier (API key or IP)
         if g.get('api_key_info'):
             identifier = f"key_{g.api_key_info['id']}"
-            limit = g.api_key_info.get('rate_limit', Config.RATE_LIMIT_DEFAULT)
+            limit = g.api_key_info.get('rate_limit', _RATE_LIMIT_DEFAULT)
         else:
             identifier = f"ip_{request.remote_addr}"
-            limit = Config.RATE_LIMIT_DEFAULT
+            limit = _RATE_LIMIT_DEFAULT
         
-        # Clean old requests (older than 1 minute)
-        now = datetime.utcnow()
-        cutoff = now - timedelta(minutes=1)
-        self.request_counts[identifier] = [
-            req_time for req_time in self.request_counts[identifier]
-            if req_time > cutoff
-        ]
+        allowed = None
+        if self.redis_client is not None:
+            try:
+                allowed = self._take_shared(identifier, limit)
+            except RedisError:
+                pass
+        if allowed is None:
+            allowed = self._take_local(identifier, limit)
         
-        # Check limit
-        if len(self.request_counts[identifier]) >= limit:
+        if not allowed:
             return jsonify({
                 'error': 'Rate limit exceeded',
                 'limit': limit,
                 'window': '1 minute'
             }), 429
         
-        # Record request
-        self.request_counts[identifier].append(now)
-        
         return None
     
+    def _take_shared(self, identifier, limit):
+        """Count the request in a Redis fixed one-minute window"""
+        key = f"a2a:ratelimit:{identifier}:{int(time.time() // 60)}"
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, RATE_LIMIT_KEY_TTL)
+        count, _ = pipe.execute()
+        return count <= limit
+    
+    def _take_local(self, identifier, limit):
+        """Take a token from the identifier's in-process bucket"""
+        now = time.monotonic()
+        with self._buckets_lock:
+            if now >= self._next_sweep:
+                self._sweep_buckets(now)
+            bucket = self.buckets.setdefault(identifier, [limit, now])
+            # Refill for the time since the last request
+            bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * (limit / 60.0))
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                return False
+            bucket[0] -= 1.0
+            return True
+    
+    def _sweep_buckets(self, now):
+        """Drop idle buckets, so identifiers seen once don't stay forever"""
+        self.buckets = {
+            identifier: bucket for identifier, bucket in self.buckets.items()
+            if now - bucket[1] <= RATE_LIMIT_BUCKET_IDLE
+        }
+        self._next_sweep = now + RATE_LIMIT_BUCKET_IDLE
+    
     def log_request(self, response):
         """Log request for monitoring"""
         if hasattr(g, 'start_time'):
-            response_time = int((time.time() - g.start_time) * 1000)
+            now = time.time()
+            response_time = int((now - g.start_time) * 1000)
             
-            # Log to database
-            db.log_request(
-                api_key_id=g.api_key_info['id'] if g.get('api_key_info') else None,
-                endpoint=request.path,
-                method=request.method,
-                ip_address=request.remote_addr,
-                response_code=response.status_code,
-                response_time_ms=response_time
-            )
+            # Queue for the background writer
+            try:
+                _log_queue.put_nowait((
+                    g.api_key_info['id'] if g.get('api_key_info') else None,
+                    request.path,
+                    request.method,
+                    request.remote_addr,
+                    now,
+                    response.status_code,
+                    response_time
+                ))
+            except queue.Full:
+                pass
         
         return response
 
@@ -0,0 +1,47 @@
+"""
+Gunicorn settings for the Jules API
+
+    gunicorn -c api/gunicorn_conf.py api.jules_server:app
+
+gevent workers serve many requests each, so handlers waiting on Redis or
+long-polling /agent/<id>/tasks/wait don't hold up the others. Gunicorn
+monkey-patches the worker before it imports the app. The app is not
+preloaded in the master for that reason; each worker imports it, and the
+storage migrations that run on import take a file lock so only one worker
+does them.
+
+Prometheus metrics run in multiprocess mode: workers write their values
+to PROMETHEUS_MULTIPROC_DIR, which is emptied when gunicorn starts, and
+/metrics reports the sum over all of them.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+# Set before the workers are forked, so they inherit it
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "a2a_prometheus")
+)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', os.environ.get('A2A_JULES_PORT', '5000'))}"
+worker_class = "gevent"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Concurrent requests per worker
+worker_connections = int(os.environ.get("A2A_WORKER_CONNECTIONS", "1000"))
+# Long polls hold a request for up to LONG_POLL_MAX_TIMEOUT (30s)
+timeout = 60
+
+
+def on_starting(server):
+    """Clear the metric files of a previous run"""
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Drop the live gauge values of a worker that exited"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
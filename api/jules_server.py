@@ -1,11 +1,39 @@
 from flask import Flask, request, jsonify, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.http import generate_etag
+from collections import OrderedDict, deque
+from itertools import islice
 from pathlib import Path
-import datetime, json
+import calendar
+import json
+import math
 import os
+import socket
+import threading
+import time
 import redis
 import uuid
-from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError,
+    RedisError, ResponseError
+)
+from redis.utils import HIREDIS_AVAILABLE
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
 try:
     from .metrics import (
         tasks_total, tasks_processed_total, tasks_acknowledged_total,
@@ -17,73 +45,506 @@ except ImportError:
         active_tasks, redis_connection_status, track_request_time, get_metrics
     )
 
+loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def dumps(obj):
+    """Serialize to compact JSON bytes, preferring orjson's native encoder"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    # Same compact form as orjson, so stored tasks don't carry separator
+    # whitespace through Redis and every /tasks response
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson
+
+    Covers jsonify(), dict return values and request.get_json().
+    """
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
+
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for all domains
+if COMPRESS_AVAILABLE:
+    # gzip/brotli for JSON task lists; bodies under COMPRESS_MIN_SIZE are sent as is
+    app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+    app.config["COMPRESS_LEVEL"] = 4
+    Compress(app)
 
 # Initialize Redis client
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.environ.get('REDIS_PORT', '6379'))
 REDIS_DB = int(os.environ.get('REDIS_DB', '0'))
+# Shared by all request threads (or gevent greenlets) of the process;
+# callers wait up to REDIS_POOL_TIMEOUT seconds for a free connection
+# instead of failing. Replies are parsed by hiredis when it is installed.
+REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', '64'))
+REDIS_POOL_TIMEOUT = 2
+
+redis_pool = redis.BlockingConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=REDIS_DB,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT,
+    socket_keepalive=True,
+    socket_keepalive_options=(
+        {socket.TCP_KEEPIDLE: 30} if hasattr(socket, "TCP_KEEPIDLE") else {}
+    ),
+    decode_responses=True
+)
 
 try:
-    redis_client = redis.Redis(
-        host=REDIS_HOST,
-        port=REDIS_PORT,
-        db=REDIS_DB,
-        decode_responses=True
-    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     # Test connection
     redis_client.ping()
-    print(f"Connected to Redis at {REDIS_HOST}:{REDIS_PORT}")
+    print(
+        f"Connected to Redis at {REDIS_HOST}:{REDIS_PORT} "
+        f"(parser: {'hiredis' if HIREDIS_AVAILABLE else 'python'})"
+    )
 except RedisConnectionError:
     print(f"Warning: Could not connect to Redis at {REDIS_HOST}:{REDIS_PORT}")
     print("Falling back to file-based storage")
     redis_client = None
 
+# All tasks in Redis: a2a:tasks_z is a ZSET of task JSON scored by creation
+# time, so /tasks can return a time range without reading the whole set.
+# Agent queues in Redis: a2a:agent_tasks:{agent} is a HASH of task id ->
+# task JSON, and a2a:agent_tasks_order:{agent} a ZSET of task ids scored by
+# creation time, so a task is found by id without scanning the queue.
+
+# Pending tasks of an agent in creation order, in one round trip
+# KEYS: agent task order, agent task hash
+PENDING_AGENT_TASKS_SCRIPT = """
+local ids = redis.call('ZRANGE', KEYS[1], 0, -1)
+local tasks = {}
+for i = 1, #ids, 1000 do
+    local values = redis.call('HMGET', KEYS[2], unpack(ids, i, math.min(i + 999, #ids)))
+    for _, value in ipairs(values) do
+        if value then
+            tasks[#tasks + 1] = value
+        end
+    end
+end
+return tasks
+"""
+
+# Completes an agent task in one round trip: removes it from the agent's
+# queue, records the completion and queues the response as a new general
+# task under the next counter id. Returns 1, or 0 if not found.
+# KEYS: agent task hash, agent task order, completed list, task counter, task set
+# ARGV: task id, completion JSON, new task text, created timestamp, created epoch
+COMPLETE_AGENT_TASK_SCRIPT = """
+if redis.call('HDEL', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('LPUSH', KEYS[3], ARGV[2])
+local id = redis.call('INCR', KEYS[4])
+redis.call('ZADD', KEYS[5], ARGV[5], cjson.encode({id = id, task = ARGV[3], created = ARGV[4]}))
+return 1
+"""
+
+# Unassigned /tasks entries as a JSON array of {"task_id", "data"}, built on
+# the server in one round trip. The task:{id} hashes are read by name, so
+# this is not cluster-safe, like the rest of the task:* endpoints.
+# KEYS: unassigned task id set
+UNASSIGNED_TASKS_SCRIPT = """
+local tasks = {}
+for _, task_id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local fields = redis.call('HGETALL', 'task:' .. task_id)
+    if #fields > 0 then
+        local data = {}
+        for i = 1, #fields, 2 do
+            data[fields[i]] = fields[i + 1]
+        end
+        tasks[#tasks + 1] = cjson.encode({task_id = task_id, data = data})
+    end
+end
+return '[' .. table.concat(tasks, ',') .. ']'
+"""
+# Adds the given ids of task:{id} hashes without "assigned_to" to the
+# unassigned set, checking and adding in one step so a concurrent PUT
+# assigning the task isn't undone. Returns how many were added.
+# KEYS: unassigned task id set
+# ARGV: task ids
+INDEX_UNASSIGNED_TASKS_SCRIPT = """
+local added = 0
+for _, task_id in ipairs(ARGV) do
+    local key = 'task:' .. task_id
+    if redis.call('EXISTS', key) == 1 and redis.call('HEXISTS', key, 'assigned_to') == 0 then
+        added = added + redis.call('SADD', KEYS[1], task_id)
+    end
+end
+return added
+"""
+if redis_client:
+    pending_agent_tasks_script = redis_client.register_script(PENDING_AGENT_TASKS_SCRIPT)
+    complete_agent_task_script = redis_client.register_script(COMPLETE_AGENT_TASK_SCRIPT)
+    unassigned_tasks_script = redis_client.register_script(UNASSIGNED_TASKS_SCRIPT)
+    index_unassigned_tasks_script = redis_client.register_script(INDEX_UNASSIGNED_TASKS_SCRIPT)
+
 # Fallback file storage (kept for compatibility)
 BASE = Path(__file__).parent.parent
-TASKS_FILE = BASE / "shared" / "tasks.json"
+# One JSON object per line, so adding a task is a single append
+TASKS_FILE = BASE / "shared" / "tasks.jsonl"
+LEGACY_TASKS_FILE = BASE / "shared" / "tasks.json"  # JSON array, older versions
 AGENT_TASKS_FILE = BASE / "shared" / "agent_tasks.json"
+# Held while migrating storage, so only one gunicorn worker does it
+MIGRATION_LOCK_FILE = BASE / "shared" / ".migration.lock"
+
+# Long-poll: how long /tasks/wait may hold a request, and how often it
+# re-checks the queue meanwhile
+LONG_POLL_MAX_TIMEOUT = 30.0
+LONG_POLL_INTERVAL = 0.25
+
+# Most tasks /tasks returns in one response; older ones are reached with ?since=
+TASK_LIST_LIMIT = 1000
+
+# Task lists served to polling clients are cached this long. Writes through
+# this process clear the cache; writes by other workers show up once the
+# entry expires.
+LIST_CACHE_TTL = 0.5
+LIST_CACHE_SIZE = 256
+
+# (epoch second, formatted timestamp); timestamps only have second
+# resolution, so the string is rebuilt once per second
+_now_cache = (0, "")
 
 def _now():
-    return datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    """Current UTC time as an ISO 8601 string, e.g. 2025-01-01T12:00:00Z"""
+    global _now_cache
+    sec = int(time.time())
+    cached_sec, stamp = _now_cache
+    if sec != cached_sec:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+        _now_cache = (sec, stamp)
+    return stamp
 
-def _get_task_id():
-    """Get next task ID from Redis counter or file"""
-    if redis_client:
-        try:
-            return redis_client.incr("a2a:task_counter")
-        except:
-            pass
-    # Fallback to file-based counting
-    tasks = json.loads(TASKS_FILE.read_text()) if TASKS_FILE.exists() else []
-    return len(tasks) + 1
+# Circuit breaker: once Redis can't be reached, requests go straight to file
+# storage and Redis is probed again at most every REDIS_RETRY_INTERVAL seconds
+REDIS_RETRY_INTERVAL = 5.0
+_redis_healthy = True
+_redis_last_probe = 0.0
+# Errors that mean Redis can't be reached. Others, like a ResponseError
+# from a bad argument, are about one request and leave the breaker closed.
+REDIS_UNAVAILABLE = (RedisConnectionError, RedisTimeoutError)
+
+def _use_redis():
+    """Whether this request should try Redis first"""
+    global _redis_healthy, _redis_last_probe
+    if redis_client is None:
+        return False
+    if _redis_healthy:
+        return True
+    now = time.monotonic()
+    if now - _redis_last_probe < REDIS_RETRY_INTERVAL:
+        return False
+    _redis_last_probe = now
+    try:
+        redis_client.ping()
+    except RedisError:
+        return False
+    _redis_healthy = True
+    return True
+
+def _redis_failed():
+    """Log the current Redis error and open the circuit breaker"""
+    global _redis_healthy, _redis_last_probe
+    app.logger.error("Redis request failed, falling back to file storage", exc_info=True)
+    _redis_healthy = False
+    _redis_last_probe = time.monotonic()
+
+@app.errorhandler(ResponseError)
+def _redis_response_error(error):
+    """Redis refused one command; answer 500 and keep Redis as the store"""
+    app.logger.error("Redis command failed: %s", error, exc_info=error)
+    return {"error": "Storage command failed"}, 500
+
+_tasks_file_lock = threading.Lock()
+# (bytes of TASKS_FILE counted so far, tasks in them); other workers append
+# too, so only the bytes after the offset are counted on the next append
+_tasks_file_count = (0, 0)
+
+def _migrate_tasks_file():
+    """Rewrite the JSON array tasks file of older versions as JSON Lines"""
+    if TASKS_FILE.exists() or not LEGACY_TASKS_FILE.exists():
+        return
+    tasks = loads(LEGACY_TASKS_FILE.read_bytes())
+    tmp_file = TASKS_FILE.with_suffix(".tmp")
+    tmp_file.write_bytes(b"".join(dumps(task) + b"\n" for task in tasks))
+    os.replace(tmp_file, TASKS_FILE)
+
+def _append_task(task_entry, assign_id=False):
+    """Append a task to the tasks file and return the new task count
+
+    With assign_id, the entry gets the next task number as its id. The
+    file is locked while the count is brought up to date and the task
+    appended, so gunicorn workers sharing it never hand out the same id.
+    """
+    global _tasks_file_count
+    with _tasks_file_lock, open(TASKS_FILE, "a+b") as f:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        offset, count = _tasks_file_count
+        if offset > f.seek(0, os.SEEK_END):
+            # Replaced by a shorter file, count it again
+            offset, count = 0, 0
+        f.seek(offset)
+        count += sum(1 for line in f if line.strip())
+        if assign_id:
+            task_entry["id"] = count + 1
+        f.write(dumps(task_entry) + b"\n")
+        f.flush()
+        _tasks_file_count = (f.tell(), count + 1)
+        return count + 1
+
+def _read_tasks_json(since=None, limit=None):
+    """The tasks file as a JSON array, without decoding each task
+
+    With since, only the first limit tasks created at or after that epoch
+    time; otherwise the last limit tasks.
+    """
+    if not TASKS_FILE.exists():
+        return b"[]"
+    with open(TASKS_FILE, "rb") as f:
+        lines = (line.rstrip() for line in f if line.strip())
+        if since is not None:
+            lines = islice(
+                (line for line in lines if _created_epoch(loads(line).get("created")) >= since),
+                limit
+            )
+        elif limit is not None:
+            lines = deque(lines, maxlen=limit)
+        return b"[" + b",".join(lines) + b"]"
+
+def _created_epoch(created):
+    """Epoch seconds of a task's created timestamp, 0 if missing or malformed"""
+    try:
+        return calendar.timegm(time.strptime(created, "%Y-%m-%dT%H:%M:%SZ"))
+    except (TypeError, ValueError):
+        return 0
+
+def _migrate_task_list():
+    """Move tasks from the a2a:tasks list of older versions into a2a:tasks_z"""
+    try:
+        tasks_json = redis_client.lrange("a2a:tasks", 0, -1)
+        if not tasks_json:
+            return
+        pipe = redis_client.pipeline()
+        pipe.zadd("a2a:tasks_z", {
+            task: _created_epoch(loads(task).get("created")) for task in tasks_json
+        })
+        pipe.delete("a2a:tasks")
+        pipe.execute()
+    except RedisError:
+        app.logger.exception("Could not migrate the a2a:tasks list")
+
+def _migrate_agent_queues():
+    """Re-key agent queues that older versions kept as lists into the
+    task-id hash and creation-order zset"""
+    try:
+        for key in redis_client.scan_iter("a2a:agent_tasks:*", _type="list"):
+            tasks = {}
+            for task_json in redis_client.lrange(key, 0, -1):
+                task = loads(task_json)
+                if "id" in task:
+                    tasks[task["id"]] = (task_json, _created_epoch(task.get("created")))
+            agent_id = key.split(":", 2)[2]
+            pipe = redis_client.pipeline()
+            pipe.delete(key)
+            if tasks:
+                pipe.hset(key, mapping={task_id: task_json for task_id, (task_json, _) in tasks.items()})
+                pipe.zadd(f"a2a:agent_tasks_order:{agent_id}",
+                          {task_id: created for task_id, (_, created) in tasks.items()})
+            pipe.execute()
+    except RedisError:
+        app.logger.exception("Could not migrate the agent task lists")
+
+def _index_unassigned_tasks():
+    """Add tasks posted to /tasks before a2a:unassigned_tasks existed to it
+
+    Runs once; a marker key records that the task:* hashes were scanned.
+    """
+    try:
+        if redis_client.exists("a2a:unassigned_tasks_indexed"):
+            return
+        batch = []
+        for key in redis_client.scan_iter("task:*", count=500, _type="hash"):
+            batch.append(key.split(":", 1)[1])
+            if len(batch) == 500:
+                index_unassigned_tasks_script(keys=["a2a:unassigned_tasks"], args=batch)
+                batch = []
+        if batch:
+            index_unassigned_tasks_script(keys=["a2a:unassigned_tasks"], args=batch)
+        redis_client.set("a2a:unassigned_tasks_indexed", _now())
+    except RedisError:
+        app.logger.exception("Could not index the unassigned tasks")
+
+_list_cache = OrderedDict()  # key -> (expires at, value), LRU order
+_list_cache_lock = threading.Lock()
+_list_cache_generation = 0  # bumped on every write
+
+def _cached_list(key, build):
+    """build(), reused for LIST_CACHE_TTL seconds unless a write happens"""
+    now = time.monotonic()
+    with _list_cache_lock:
+        cached = _list_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _list_cache.move_to_end(key)
+            return cached[1]
+        generation = _list_cache_generation
+    
+    value = build()
+    with _list_cache_lock:
+        # A write while building may have made the value stale already
+        if generation == _list_cache_generation:
+            _list_cache[key] = (now + LIST_CACHE_TTL, value)
+            _list_cache.move_to_end(key)
+            if len(_list_cache) > LIST_CACHE_SIZE:
+                _list_cache.popitem(last=False)
+    return value
+
+@app.after_request
+def _invalidate_list_cache(response):
+    """Any write may change a task list, so drop the cached ones"""
+    global _list_cache_generation
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        with _list_cache_lock:
+            _list_cache_generation += 1
+            _list_cache.clear()
+    return response
+
+def _migrate_storage():
+    """Convert storage left by older versions, one process at a time
+
+    Every gunicorn worker imports this module. The lock makes the others
+    wait until the first has finished, after which there is nothing left
+    for them to convert.
+    """
+    MIGRATION_LOCK_FILE.parent.mkdir(exist_ok=True)
+    with open(MIGRATION_LOCK_FILE, "ab") as lock_file:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        _migrate_tasks_file()
+        if redis_client:
+            _migrate_task_list()
+            _migrate_agent_queues()
+            _index_unassigned_tasks()
+
+_migrate_storage()
+
+_INDEX_BODY = dumps(
+    {"service": "A2A Jules API", "status": "running", "endpoints": ["/health", "/tasks", "/add_task", "/metrics"]}
+)
 
 @app.route("/")
 def index():
-    return {"service": "A2A Jules API", "status": "running", "endpoints": ["/health", "/tasks", "/add_task", "/metrics"]}
+    return Response(_INDEX_BODY, mimetype="application/json")
+
+# Load balancer probes hit /health often; its body, including the Redis
+# ping, is rebuilt at most this often
+HEALTH_CACHE_TTL = 1.0
+_health_cache = (0.0, b"")  # (expires at, body)
 
 @app.route("/health")
 @track_request_time("/health")
 def health():
+    global _health_cache
+    expires, body = _health_cache
+    now = time.monotonic()
+    if now >= expires:
+        body = _health_body()
+        _health_cache = (now + HEALTH_CACHE_TTL, body)
+    return Response(body, mimetype="application/json")
+
+def _health_body():
     redis_status = "connected"
     if redis_client:
         try:
             redis_client.ping()
             redis_connection_status.set(1)
-        except:
+        except RedisError:
             redis_status = "disconnected"
             redis_connection_status.set(0)
     else:
         redis_status = "not configured"
         redis_connection_status.set(0)
     
-    return {
+    return dumps({
         "status": "ok",
         "server_time": _now(),
         "redis": redis_status,
         "storage": "redis" if redis_client else "file"
-    }
+    })
+
+@app.route("/add_task", methods=["POST"])
+def add_agent_task():
+    """Queue a task, and on an agent's queue too when assigned_to is given
+
+    Payload: {"task": <text>, "assigned_to": <agent id, optional>}
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    if not data.get("task"):
+        return {"error": "Task is required"}, 400
+    assigned_to = data.get("assigned_to")
+    
+    if _use_redis():
+        try:
+            task_entry = {
+                "id": redis_client.incr("a2a:task_counter"),
+                "task": data["task"],
+                "created": _now()
+            }
+            if assigned_to:
+                task_entry["assigned_to"] = assigned_to
+                task_entry["status"] = "pending"
+            payload = dumps(task_entry)
+            created = time.time()
+            pipe = redis_client.pipeline()
+            pipe.zadd("a2a:tasks_z", {payload: created})
+            pipe.zcard("a2a:tasks_z")
+            if assigned_to:
+                pipe.hset(f"a2a:agent_tasks:{assigned_to}", task_entry["id"], payload)
+                pipe.zadd(f"a2a:agent_tasks_order:{assigned_to}", {task_entry["id"]: created})
+            total_tasks = pipe.execute()[1]
+            _count_new_task(assigned_to)
+            return {"status": "Task added", "task": task_entry, "total_tasks": total_tasks}, 201
+        except REDIS_UNAVAILABLE:
+            # Fall through to file storage
+            _redis_failed()
+    
+    # File-based storage (fallback)
+    task_entry = {"id": None, "task": data["task"], "created": _now()}
+    if assigned_to:
+        task_entry["assigned_to"] = assigned_to
+        task_entry["status"] = "pending"
+    total_tasks = _append_task(task_entry, assign_id=True)
+    if assigned_to:
+        agent_tasks = loads(AGENT_TASKS_FILE.read_bytes()) if AGENT_TASKS_FILE.exists() else {}
+        agent_tasks.setdefault(assigned_to, []).append(task_entry)
+        AGENT_TASKS_FILE.write_text(json.dumps(agent_tasks, indent=2))
+    _count_new_task(assigned_to)
+    return {"status": "Task added", "task": task_entry, "total_tasks": total_tasks}, 201
+
+def _count_new_task(assigned_to):
+    tasks_total.labels(assigned_to=assigned_to or "unassigned").inc()
+    if assigned_to:
+        active_tasks.labels(agent=assigned_to).inc()
 
 @app.route("/tasks", methods=["POST"])
 def add_task():
@@ -93,11 +554,14 @@ def add_task():
 
     task_id = str(uuid.uuid4())
 
-    # For simplicity, we'll just store the update in a new hash
-    redis_client.hset(f"task:{task_id}", mapping=data)
-
-    # Add task data to a stream
-    redis_client.xadd('a2a_stream', {"task_id": task_id})
+    # Store the task in its hash, index it if unassigned and announce it on
+    # the stream, in one round trip
+    pipe = redis_client.pipeline()
+    pipe.hset(f"task:{task_id}", mapping=data)
+    if "assigned_to" not in data:
+        pipe.sadd("a2a:unassigned_tasks", task_id)
+    pipe.xadd('a2a_stream', {"task_id": task_id})
+    pipe.execute()
 
     return jsonify({"task_id": task_id}), 201
 
@@ -109,7 +573,11 @@ def update_task(id):
         return jsonify({"error": "Invalid payload"}), 400
 
     # For simplicity, we'll just store the update in a new hash
-    redis_client.hset(f"task:{id}", mapping=data)
+    pipe = redis_client.pipeline()
+    pipe.hset(f"task:{id}", mapping=data)
+    if "assigned_to" in data:
+        pipe.srem("a2a:unassigned_tasks", id)
+    pipe.execute()
     
     return jsonify({"message": "Task updated"}), 200
 
@@ -120,24 +588,22 @@ def complete_task(id):
     if not data or 'result' not in data:
         return jsonify({"error": "Invalid payload"}), 400
 
-    redis_client.hset(f"task:{id}", mapping={"status": "completed", "result": json.dumps(data['result'])})
+    redis_client.hset(f"task:{id}", mapping={"status": "completed", "result": dumps(data['result'])})
     
     return jsonify({"message": "Task marked as complete"}), 200
 
 
 @app.route("/tasks/unassigned", methods=["GET"])
 def get_unassigned_tasks():
-    # This is a conceptual example. A real implementation would need a more robust way to track assignments.
-    # For now, we'll return all tasks that don't have an "assigned_to" field.
-    tasks = []
-    for key in redis_client.scan_iter("task:*"):
-        task_data = redis_client.hgetall(key)
-        if b'assigned_to' not in task_data:
-            tasks.append({
-                "task_id": key.decode('utf-8').split(':')[1],
-                "data": {k.decode('utf-8'): v.decode('utf-8') for k, v in task_data.items()}
-            })
-    return jsonify(tasks)
+    """Tasks posted to /tasks without an "assigned_to" field
+
+    Read through the a2a:unassigned_tasks set of task ids, which POST and
+    PUT /tasks keep up to date, rather than scanning every task:* key.
+    Tasks stored before the set existed are added to it on startup. A
+    Lua script reads the set and the task hashes and returns the JSON.
+    """
+    tasks_json = unassigned_tasks_script(keys=["a2a:unassigned_tasks"])
+    return Response(tasks_json, mimetype="application/json")
 
 
 @app.route("/tasks/<string:id>", methods=["GET"])
@@ -153,86 +619,259 @@ def get_task(id):
 
 @app.route("/tasks")
 def list_tasks():
-    if redis_client:
+    """List tasks
+
+    By default the newest TASK_LIST_LIMIT tasks. With ?since=<epoch seconds>,
+    tasks created at or after that time, oldest first, so a client can page
+    forward. ?limit= lowers the number returned. /tasks/export returns
+    every task.
+    """
+    try:
+        since = request.args.get("since")
+        since = None if since is None else float(since)
+        limit = min(int(request.args.get("limit", TASK_LIST_LIMIT)), TASK_LIST_LIMIT)
+    except ValueError:
+        return {"error": "Invalid since or limit"}, 400
+    if since is not None and not math.isfinite(since):
+        return {"error": "Invalid since or limit"}, 400
+    if limit <= 0:
+        return Response("[]", mimetype="application/json")
+    
+    body = _cached_list(("tasks", since, limit), lambda: _list_tasks_json(since, limit))
+    return Response(body, mimetype="application/json")
+
+def _list_tasks_json(since, limit):
+    """Response body of list_tasks, built once per cache entry"""
+    if _use_redis():
         try:
-            # Get tasks from Redis (newest first)
-            tasks_json = redis_client.lrange("a2a:tasks", 0, -1)
-            tasks = [json.loads(task) for task in tasks_json]
-            return jsonify(tasks)
-        except:
+            # Each entry is already a JSON object, so the array is assembled
+            # without decoding them
+            if since is None:
+                tasks_json = redis_client.zrevrange("a2a:tasks_z", 0, limit - 1)
+            else:
+                tasks_json = redis_client.zrangebyscore(
+                    "a2a:tasks_z", since, "+inf", start=0, num=limit
+                )
+            return _json_array(tasks_json)
+        except REDIS_UNAVAILABLE:
             # Fall through to file storage
-            pass
+            _redis_failed()
     
     # File-based storage (fallback)
-    tasks = json.loads(TASKS_FILE.read_text()) if TASKS_FILE.exists() else []
-    return jsonify(tasks)
+    return _read_tasks_json(since, limit)
+
+@app.route("/tasks/export")
+def export_tasks():
+    """Every task as JSON Lines, oldest first, for backups
+
+    Unlike /tasks this is not capped at TASK_LIST_LIMIT.
+    """
+    if _use_redis():
+        try:
+            tasks_json = redis_client.zrange("a2a:tasks_z", 0, -1)
+            return Response(
+                "".join(task + "\n" for task in tasks_json), mimetype="application/x-ndjson"
+            )
+        except REDIS_UNAVAILABLE:
+            # Fall through to file storage
+            _redis_failed()
+    
+    if not TASKS_FILE.exists():
+        return Response(b"", mimetype="application/x-ndjson")
+    return Response(TASKS_FILE.read_bytes(), mimetype="application/x-ndjson")
 
 @app.route("/agent/<agent_id>/tasks")
 def get_agent_tasks(agent_id):
-    """Get pending tasks for a specific agent"""
-    if redis_client:
+    """Get pending tasks for a specific agent
+    
+    The response carries an ETag; a client sending it back in If-None-Match
+    gets an empty 304 while its pending list is unchanged.
+    """
+    return _tasks_response(*_pending_agent_tasks(agent_id)).make_conditional(request)
+
+@app.route("/agent/<agent_id>/tasks/wait")
+def wait_for_agent_tasks(agent_id):
+    """Long-poll for pending tasks
+
+    Returns as soon as the agent has pending tasks, or an empty list once
+    ?timeout= seconds (capped at LONG_POLL_MAX_TIMEOUT) have passed. Pending
+    tasks matching the client's If-None-Match don't count as new: the request
+    keeps waiting for a change and answers 304 if none comes.
+    """
+    try:
+        timeout = float(request.args.get("timeout", LONG_POLL_MAX_TIMEOUT))
+    except ValueError:
+        return {"error": "Invalid timeout"}, 400
+    deadline = time.monotonic() + max(0.0, min(timeout, LONG_POLL_MAX_TIMEOUT))
+    
+    while True:
+        body, etag = _pending_agent_tasks(agent_id)
+        expired = time.monotonic() >= deadline
+        if body != b"[]" or expired:
+            if expired or not request.if_none_match.contains_weak(etag):
+                return _tasks_response(body, etag).make_conditional(request)
+        time.sleep(LONG_POLL_INTERVAL)
+
+def _tasks_response(body, etag):
+    """JSON task list response tagged with the ETag of its content
+
+    The ETag is weak so it stays the same whether or not the body is
+    compressed on the way out.
+    """
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag, weak=True)
+    return response
+
+def _pending_agent_tasks(agent_id):
+    """Response body of an agent's pending tasks, oldest first, and its ETag
+    
+    The tag is a hash of the body rather than a queue version counter, as
+    tasks are also queued by other processes through Redis or the shared
+    tasks file.
+    """
+    def build():
+        body = _json_array(_read_pending_agent_tasks(agent_id))
+        return body, generate_etag(body)
+    return _cached_list(("agent", agent_id), build)
+
+def _json_array(items_json):
+    """UTF-8 JSON array of already encoded JSON strings"""
+    return ("[" + ",".join(items_json) + "]").encode()
+
+def _read_pending_agent_tasks(agent_id):
+    if _use_redis():
         try:
-            # Get agent tasks from Redis
-            tasks_json = redis_client.lrange(f"a2a:agent_tasks:{agent_id}", 0, -1)
-            tasks = [json.loads(task) for task in tasks_json]
-            # Filter pending tasks (all tasks in Redis are pending by default)
-            pending_tasks = [task for task in tasks if task.get("status", "pending") == "pending"]
-            return jsonify(pending_tasks)
-        except:
+            # A task stays in the agent's Redis queue only while pending, so
+            # the stored JSON is returned as is, without decoding it
+            return pending_agent_tasks_script(
+                keys=[f"a2a:agent_tasks_order:{agent_id}", f"a2a:agent_tasks:{agent_id}"]
+            )
+        except REDIS_UNAVAILABLE:
             # Fall through to file storage
-            pass
+            _redis_failed()
     
     # File-based storage (fallback)
-    agent_tasks = json.loads(AGENT_TASKS_FILE.read_text()) if AGENT_TASKS_FILE.exists() else {}
+    agent_tasks = loads(AGENT_TASKS_FILE.read_bytes()) if AGENT_TASKS_FILE.exists() else {}
     agent_queue = agent_tasks.get(agent_id, [])
-    pending_tasks = [task for task in agent_queue if task["status"] == "pending"]
-    return jsonify(pending_tasks)
+    return [dumps(task).decode() for task in agent_queue if task["status"] == "pending"]
 
+# Agents acknowledge and complete in bulk through the routes below, and use
+# the per-task ones only on servers that predate the bulk routes
 @app.route("/agent/<agent_id>/tasks/<int:task_id>/complete", methods=["POST"])
 def complete_agent_task(agent_id, task_id):
     """Mark an agent task as completed"""
     data = request.get_json(force=True) if request.is_json else {}
     response = data.get("response", "Task completed")
+    return _complete_agent_task(agent_id, task_id, response)
+
+@app.route("/agent/<agent_id>/tasks/complete_bulk", methods=["POST"])
+def complete_agent_tasks(agent_id):
+    """Complete several agent tasks in one request
+
+    Payload: {"results": [{"id": <task_id>, "response": <text>}, ...]}
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    results = data.get("results")
+    if not isinstance(results, list):
+        return {"error": "Invalid payload"}, 400
     
-    if redis_client:
+    return _complete_agent_tasks(agent_id, results, acknowledge=False)
+
+def _task_id(value):
+    """value as an integer task id, None if it isn't one"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+def _complete_agent_tasks(agent_id, results, acknowledge):
+    """Response of the bulk completion endpoints"""
+    pairs = []
+    for result in results:
+        task_id = _task_id(result.get("id")) if isinstance(result, dict) else None
+        if task_id is None:
+            return {"error": "Each result needs an integer id"}, 400
+        pairs.append((task_id, result.get("response", "Task completed")))
+    if _use_redis():
         try:
-            # Remove from agent's task list
-            tasks_json = redis_client.lrange(f"a2a:agent_tasks:{agent_id}", 0, -1)
-            for i, task_json in enumerate(tasks_json):
-                task = json.loads(task_json)
-                if task["id"] == task_id:
-                    # Remove from agent's list
-                    redis_client.lrem(f"a2a:agent_tasks:{agent_id}", 1, task_json)
-                    
-                    # Add completion record
-                    completion = {
-                        "task_id": task_id,
-                        "agent_id": agent_id,
-                        "completed": _now(),
-                        "response": response
-                    }
-                    redis_client.lpush("a2a:completed_tasks", json.dumps(completion))
-                    
-                    # Also add response as new task
-                    new_task = {
-                        "id": _get_task_id(),
-                        "task": f"[{agent_id}] {response}",
-                        "created": _now()
-                    }
-                    redis_client.lpush("a2a:tasks", json.dumps(new_task))
-                    
-                    # Track metrics
-                    tasks_processed_total.labels(agent=agent_id).inc()
-                    active_tasks.labels(agent=agent_id).dec()
-                    return {"message": "Task completed", "response": response}, 200
+            found = _complete_agent_tasks_redis(agent_id, pairs, acknowledge)
+            completed = [result.get("id") for result, ok in zip(results, found) if ok]
+            failed = [result.get("id") for result, ok in zip(results, found) if not ok]
+            return {"completed": completed, "failed": failed}, 200
+        except REDIS_UNAVAILABLE:
+            # Fall through to file storage
+            _redis_failed()
+    
+    # File-based storage (fallback)
+    completed, failed = [], []
+    for result, (task_id, response) in zip(results, pairs):
+        if acknowledge:
+            _acknowledge_agent_task(agent_id, task_id)
+        _body, status = _complete_agent_task(agent_id, task_id, response)
+        (completed if status == 200 else failed).append(result.get("id"))
+    return {"completed": completed, "failed": failed}, 200
+
+def _run_complete_script(agent_id, task_id, response, now, client=None):
+    """Run the completion script, or queue it on the pipeline given as client"""
+    completion = {
+        "task_id": task_id,
+        "agent_id": agent_id,
+        "completed": now,
+        "response": response
+    }
+    # Remove from agent's list, record the completion and add the response
+    # as a new task, atomically on the server
+    return complete_agent_task_script(
+        keys=[f"a2a:agent_tasks:{agent_id}", f"a2a:agent_tasks_order:{agent_id}",
+              "a2a:completed_tasks", "a2a:task_counter", "a2a:tasks_z"],
+        args=[task_id, dumps(completion), f"[{agent_id}] {response}", now, time.time()],
+        client=client
+    )
+
+def _complete_agent_tasks_redis(agent_id, results, acknowledge=False):
+    """Complete (task id, response) pairs in one pipeline
+
+    With acknowledge, each task is acknowledged first. Returns, for each
+    pair, whether its task was found and completed.
+    """
+    now = _now()
+    pipe = redis_client.pipeline(transaction=False)
+    for task_id, response in results:
+        if acknowledge:
+            pipe.hset("a2a:task_acks", f"{agent_id}:{task_id}", _ack_entry(agent_id, task_id, now))
+        _run_complete_script(agent_id, task_id, response, now, client=pipe)
+    replies = pipe.execute()
+    if acknowledge:
+        tasks_acknowledged_total.labels(agent=agent_id).inc(len(results))
+        replies = replies[1::2]
+    found = [bool(reply) for reply in replies]
+    tasks_processed_total.labels(agent=agent_id).inc(sum(found))
+    active_tasks.labels(agent=agent_id).dec(sum(found))
+    return found
+
+def _complete_agent_task(agent_id, task_id, response):
+    if _use_redis():
+        try:
+            found = _run_complete_script(agent_id, task_id, response, _now())
+            if not found:
+                return {"error": "Task not found"}, 404
             
-            return {"error": "Task not found"}, 404
-        except:
+            # Track metrics
+            tasks_processed_total.labels(agent=agent_id).inc()
+            active_tasks.labels(agent=agent_id).dec()
+            return {"message": "Task completed", "response": response}, 200
+        except REDIS_UNAVAILABLE:
             # Fall through to file storage
-            pass
+            _redis_failed()
     
     # File-based storage (fallback)
-    agent_tasks = json.loads(AGENT_TASKS_FILE.read_text()) if AGENT_TASKS_FILE.exists() else {}
+    agent_tasks = loads(AGENT_TASKS_FILE.read_bytes()) if AGENT_TASKS_FILE.exists() else {}
     if agent_id not in agent_tasks:
         return {"error": "Agent not found"}, 404
     
@@ -249,33 +888,80 @@ def complete_agent_task(agent_id, task_id):
     AGENT_TASKS_FILE.write_text(json.dumps(agent_tasks, indent=2))
     
     # Also add the response as a new general task
-    tasks = json.loads(TASKS_FILE.read_text()) if TASKS_FILE.exists() else []
-    tasks.append({"task": f"[{agent_id}] {response}", "created": _now()})
-    TASKS_FILE.write_text(json.dumps(tasks, indent=2))
+    _append_task({"task": f"[{agent_id}] {response}", "created": _now()})
     
     return {"message": "Task completed", "response": response}, 200
 
 @app.route("/agent/<agent_id>/tasks/<int:task_id>/acknowledge", methods=["POST"])
 def acknowledge_agent_task(agent_id, task_id):
     """Agent acknowledges receiving a task"""
-    if redis_client:
+    return _acknowledge_agent_task(agent_id, task_id)
+
+@app.route("/agent/<agent_id>/tasks/acknowledge_bulk", methods=["POST"])
+def acknowledge_agent_tasks(agent_id):
+    """Acknowledge several agent tasks in one request
+
+    Payload: {"ids": [<task_id>, ...]}
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    ids = data.get("ids")
+    if not isinstance(ids, list):
+        return {"error": "Invalid payload"}, 400
+    task_ids = [_task_id(task_id) for task_id in ids]
+    if None in task_ids:
+        return {"error": "Task ids must be integers"}, 400
+    
+    if ids and _use_redis():
+        try:
+            # All acknowledgments in a single HSET
+            now = _now()
+            redis_client.hset("a2a:task_acks", mapping={
+                f"{agent_id}:{task_id}": _ack_entry(agent_id, task_id, now) for task_id in task_ids
+            })
+            tasks_acknowledged_total.labels(agent=agent_id).inc(len(ids))
+            return {"acknowledged": ids, "failed": []}, 200
+        except REDIS_UNAVAILABLE:
+            # Fall through to file storage
+            _redis_failed()
+    
+    acknowledged, failed = [], []
+    for task_id, int_id in zip(ids, task_ids):
+        _body, status = _acknowledge_agent_task(agent_id, int_id)
+        (acknowledged if status == 200 else failed).append(task_id)
+    return {"acknowledged": acknowledged, "failed": failed}, 200
+
+@app.route("/agent/<agent_id>/tasks/batch", methods=["POST"])
+def acknowledge_and_complete_agent_tasks(agent_id):
+    """Acknowledge and complete several agent tasks in one request
+
+    For agents that answer a task as soon as they see it, saving the separate
+    acknowledge round trip.
+    Payload: {"completions": [{"id": <task_id>, "response": <text>}, ...]}
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    completions = data.get("completions")
+    if not isinstance(completions, list):
+        return {"error": "Invalid payload"}, 400
+    
+    return _complete_agent_tasks(agent_id, completions, acknowledge=True)
+
+def _ack_entry(agent_id, task_id, now):
+    return dumps({"task_id": task_id, "agent_id": agent_id, "acknowledged": now})
+
+def _acknowledge_agent_task(agent_id, task_id):
+    if _use_redis():
         try:
             # Store acknowledgment in Redis
-            ack = {
-                "task_id": task_id,
-                "agent_id": agent_id,
-                "acknowledged": _now()
-            }
-            redis_client.hset(f"a2a:task_acks", f"{agent_id}:{task_id}", json.dumps(ack))
+            redis_client.hset("a2a:task_acks", f"{agent_id}:{task_id}", _ack_entry(agent_id, task_id, _now()))
             # Track metrics
             tasks_acknowledged_total.labels(agent=agent_id).inc()
             return {"message": "Task acknowledged"}, 200
-        except:
+        except REDIS_UNAVAILABLE:
             # Fall through to file storage
-            pass
+            _redis_failed()
     
     # File-based storage (fallback)
-    agent_tasks = json.loads(AGENT_TASKS_FILE.read_text()) if AGENT_TASKS_FILE.exists() else {}
+    agent_tasks = loads(AGENT_TASKS_FILE.read_bytes()) if AGENT_TASKS_FILE.exists() else {}
     if agent_id not in agent_tasks:
         return {"error": "Agent not found"}, 404
     
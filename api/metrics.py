@@ -1,17 +1,28 @@
 """
 Prometheus metrics for A2A system
 Created: 2025-07-21
+
+Under gunicorn every worker keeps its own values. With
+PROMETHEUS_MULTIPROC_DIR set (api/gunicorn_conf.py does), they are written
+there and /metrics adds up all workers, whichever one answers.
 """
 
-from prometheus_client import Counter, Gauge, Histogram, generate_latest, REGISTRY
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CollectorRegistry, REGISTRY
+from prometheus_client import multiprocess
+import os
 import time
 
 # Define metrics
 tasks_total = Counter('a2a_tasks_total', 'Total number of tasks created', ['assigned_to'])
 tasks_processed_total = Counter('a2a_tasks_processed_total', 'Total number of tasks processed', ['agent'])
 tasks_acknowledged_total = Counter('a2a_tasks_acknowledged_total', 'Total number of tasks acknowledged', ['agent'])
-active_tasks = Gauge('a2a_active_tasks', 'Number of active tasks', ['agent'])
-redis_connection_status = Gauge('a2a_redis_connection_status', 'Redis connection status (1=connected, 0=disconnected)')
+# Workers each count up and down their share; keep the share of workers
+# that have exited in the total
+active_tasks = Gauge('a2a_active_tasks', 'Number of active tasks', ['agent'], multiprocess_mode='sum')
+redis_connection_status = Gauge(
+    'a2a_redis_connection_status', 'Redis connection status (1=connected, 0=disconnected)',
+    multiprocess_mode='mostrecent'
+)
 api_request_duration = Histogram('a2a_api_request_duration_seconds', 'API request duration', ['endpoint', 'method'])
 
 # Helper decorators
@@ -29,5 +40,9 @@ def track_request_time(endpoint):
     return decorator
 
 def get_metrics():
-    """Generate Prometheus metrics in text format"""
-    return generate_latest()
\ No newline at end of file
+    """Generate Prometheus metrics in text format, across all workers"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
\ No newline at end of file
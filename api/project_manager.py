@@ -4,16 +4,56 @@ Project Management for A2A System
 Tracks multiple simultaneous projects and their outputs
 """
 from datetime import datetime
+import atexit
 import json
+import os
+import threading
 import uuid
 from pathlib import Path
+from redis.exceptions import RedisError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Seconds between writes of changed projects to disk
+PROJECTS_FLUSH_INTERVAL = 1.0
+# Redis stream of a project's activities, trimmed to about this many entries
+ACTIVITY_STREAM = "a2a:project_activity:{}"
+ACTIVITY_STREAM_MAXLEN = 1000
+
+def _dumps(obj):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode()
+
+def _activity_from_fields(fields):
+    data = fields.get("activity") or fields.get(b"activity")
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
 
 class ProjectManager:
-    def __init__(self):
+    def __init__(self, redis_client=None):
+        """With a Redis client, new activities go to a capped stream per
+        project, shared by every worker, instead of into the projects file.
+        Activities already in the file stay there, along with ones added
+        while Redis was failing, and are listed before the stream's.
+        """
+        self.redis_client = redis_client
         self.base_dir = Path(__file__).parent.parent
         self.projects_file = self.base_dir / "shared" / "projects.json"
         self.projects = {}
         self.load_projects()
+        
+        # Changes only mark the projects dirty; a background thread writes
+        # them out at most once per interval, and once more at exit
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_interval = PROJECTS_FLUSH_INTERVAL
+        self._stop = threading.Event()
+        threading.Thread(target=self._flush_loop, name="projects-flush", daemon=True).start()
+        atexit.register(self.close)
     
     def load_projects(self):
         """Load existing projects from file"""
@@ -25,14 +65,57 @@ class ProjectManager:
                 self.projects = {}
     
     def save_projects(self):
-        """Save projects to file"""
-        self.projects_file.parent.mkdir(exist_ok=True)
-        with open(self.projects_file, 'w') as f:
-            json.dump(self.projects, f, indent=2, default=str)
+        """Save projects to file
+        
+        Written to a temporary file and renamed over the old one, so readers
+        never see a partial file.
+        """
+        with self._lock:
+            self._dirty = False
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(self.projects, default=str)
+            else:
+                data = json.dumps(self.projects, default=str, separators=(",", ":")).encode()
+            self.projects_file.parent.mkdir(exist_ok=True)
+            tmp_file = self.projects_file.with_suffix(".tmp")
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.projects_file)
+    
+    def _flush_loop(self):
+        while not self._stop.wait(self._flush_interval):
+            if self._dirty:
+                try:
+                    self.save_projects()
+                except OSError as e:
+                    print(f"Warning: could not save projects: {e}")
+    
+    def close(self):
+        """Stop the flush thread and write any pending change"""
+        self._stop.set()
+        if self._dirty:
+            self.save_projects()
+    
+    def _activities(self, project_id, limit=None):
+        """Activities of a project, oldest first; only the last limit if given"""
+        activities = self.projects[project_id].get("activities", [])
+        if self.redis_client is not None:
+            key = ACTIVITY_STREAM.format(project_id)
+            try:
+                if limit is None:
+                    entries = self.redis_client.xrange(key)
+                else:
+                    entries = self.redis_client.xrevrange(key, count=limit)[::-1]
+                activities = activities + [_activity_from_fields(fields) for _, fields in entries]
+            except RedisError as e:
+                print(f"Warning: could not read project activities from Redis: {e}")
+        if limit is not None and len(activities) > limit:
+            return activities[-limit:]
+        return activities
     
     def create_project(self, name, description, assigned_agents):
         """Create a new project"""
         project_id = str(uuid.uuid4())[:8]
+        now = datetime.utcnow().isoformat() + "Z"
         
         project = {
             "id": project_id,
@@ -40,15 +123,16 @@ class ProjectManager:
             "description": description,
             "assigned_agents": assigned_agents,
             "status": "active",
-            "created_at": datetime.utcnow().isoformat() + "Z",
-            "updated_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": now,
+            "updated_at": now,
             "activities": [],
             "output": None,
             "completion_percentage": 0
         }
         
-        self.projects[project_id] = project
-        self.save_projects()
+        with self._lock:
+            self.projects[project_id] = project
+            self._dirty = True
         return project_id
     
     def add_activity(self, project_id, agent, action, details=None):
@@ -56,16 +140,29 @@ class ProjectManager:
         if project_id not in self.projects:
             return False
         
+        now = datetime.utcnow().isoformat() + "Z"
         activity = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now,
             "agent": agent,
             "action": action,
             "details": details
         }
         
-        self.projects[project_id]["activities"].append(activity)
-        self.projects[project_id]["updated_at"] = datetime.utcnow().isoformat() + "Z"
-        self.save_projects()
+        if self.redis_client is not None:
+            try:
+                self.redis_client.xadd(ACTIVITY_STREAM.format(project_id), {"activity": _dumps(activity)},
+                                       maxlen=ACTIVITY_STREAM_MAXLEN, approximate=True)
+                with self._lock:
+                    self.projects[project_id]["updated_at"] = now
+                    self._dirty = True
+                return True
+            except RedisError as e:
+                print(f"Warning: could not add project activity to Redis: {e}")
+        
+        with self._lock:
+            self.projects[project_id].setdefault("activities", []).append(activity)
+            self.projects[project_id]["updated_at"] = now
+            self._dirty = True
         return True
     
     def update_project_status(self, project_id, status, completion_percentage=None):
@@ -73,12 +170,13 @@ class ProjectManager:
         if project_id not in self.projects:
             return False
         
-        self.projects[project_id]["status"] = status
-        if completion_percentage is not None:
-            self.projects[project_id]["completion_percentage"] = completion_percentage
-        
-        self.projects[project_id]["updated_at"] = datetime.utcnow().isoformat() + "Z"
-        self.save_projects()
+        with self._lock:
+            self.projects[project_id]["status"] = status
+            if completion_percentage is not None:
+                self.projects[project_id]["completion_percentage"] = completion_percentage
+            
+            self.projects[project_id]["updated_at"] = datetime.utcnow().isoformat() + "Z"
+            self._dirty = True
         return True
     
     def set_project_output(self, project_id, output):
@@ -86,31 +184,52 @@ class ProjectManager:
         if project_id not in self.projects:
             return False
         
-        self.projects[project_id]["output"] = output
-        self.projects[project_id]["status"] = "completed"
-        self.projects[project_id]["completion_percentage"] = 100
-        self.projects[project_id]["completed_at"] = datetime.utcnow().isoformat() + "Z"
-        self.save_projects()
+        with self._lock:
+            self.projects[project_id]["output"] = output
+            self.projects[project_id]["status"] = "completed"
+            self.projects[project_id]["completion_percentage"] = 100
+            self.projects[project_id]["completed_at"] = datetime.utcnow().isoformat() + "Z"
+            self._dirty = True
         return True
     
     def get_project(self, project_id):
         """Get a specific project"""
-        return self.projects.get(project_id)
+        project = self.projects.get(project_id)
+        if project is not None and self.redis_client is not None:
+            project = {**project, "activities": self._activities(project_id)}
+        return project
     
     def get_active_projects(self):
         """Get all active projects"""
-        return {
+        active = {
             pid: proj for pid, proj in self.projects.items() 
             if proj["status"] == "active"
         }
+        if self.redis_client is None or not active:
+            return active
+        
+        # One round trip for every project's stream
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for pid in active:
+                pipe.xrange(ACTIVITY_STREAM.format(pid))
+            streams = pipe.execute()
+        except RedisError as e:
+            print(f"Warning: could not read project activities from Redis: {e}")
+            return active
+        return {
+            pid: {**proj, "activities": proj.get("activities", []) + [
+                _activity_from_fields(fields) for _, fields in entries
+            ]}
+            for (pid, proj), entries in zip(active.items(), streams)
+        }
     
     def get_recent_activities(self, project_id, limit=20):
         """Get recent activities for a project"""
         if project_id not in self.projects:
             return []
         
-        activities = self.projects[project_id]["activities"]
-        return activities[-limit:] if len(activities) > limit else activities
+        return self._activities(project_id, limit)
     
     def get_agent_summary(self, project_id, agent_name):
         """Get a summary of what an agent did in a project"""
@@ -118,7 +237,7 @@ class ProjectManager:
             return {}
         
         activities = [
-            act for act in self.projects[project_id]["activities"]
+            act for act in self._activities(project_id)
             if act["agent"] == agent_name
         ]
         
@@ -130,10 +249,10 @@ class ProjectManager:
             "last_action": activities[-1]["timestamp"] if activities else None
         }
 
-def create_project_endpoints(app, socketio):
+def create_project_endpoints(app, socketio, redis_client=None):
     """Create Flask endpoints for project management"""
     from flask import request, jsonify
-    manager = ProjectManager()
+    manager = ProjectManager(redis_client)
     
     @app.route("/api/projects", methods=["POST"])
     def create_project():
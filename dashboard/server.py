@@ -8,8 +8,10 @@ from flask import Flask, render_template_string, jsonify, request, send_from_dir
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 import json
+from collections import deque
 import os
 from pathlib import Path
+import redis
 import requests
 from datetime import datetime
 import subprocess
@@ -44,11 +46,17 @@ def stream_terminal_output():
             timestamp = datetime.now().strftime("%H:%M:%S")
             
             # Read actual task data
-            tasks_file = BASE_DIR / "shared" / "tasks.json"
+            tasks_file = BASE_DIR / "shared" / "tasks.jsonl"
+            total_tasks = 0
             if tasks_file.exists():
+                # Count the tasks and keep the last three in one pass
+                last_lines = deque(maxlen=3)
                 with open(tasks_file, 'r') as f:
-                    tasks = json.load(f)
-                    recent_tasks = tasks[-3:] if len(tasks) > 3 else tasks
+                    for line in f:
+                        if line.strip():
+                            total_tasks += 1
+                            last_lines.append(line)
+                recent_tasks = [json.loads(line) for line in last_lines]
                     
                 for task in recent_tasks:
                     if 'assigned_to' in task:
@@ -59,7 +67,7 @@ def stream_terminal_output():
                         time.sleep(2)
             
             # System status updates
-            socketio.emit('terminal_output', {'data': f"[{timestamp}] SYSTEM: A2A coordination active - {len(tasks) if 'tasks' in locals() else 0} total tasks\n"})
+            socketio.emit('terminal_output', {'data': f"[{timestamp}] SYSTEM: A2A coordination active - {total_tasks} total tasks\n"})
             socketio.emit('terminal_output', {'data': f"[{timestamp}] MONITOR: Claude, CODEX, JULES agents operational\n"})
             time.sleep(5)
             
@@ -252,11 +260,24 @@ def handle_connect():
         app.terminal_thread = socketio.start_background_task(target=stream_terminal_output)
 
 if __name__ == "__main__":
+    # Agent health and project activities are shared through Redis when it
+    # is reachable
+    redis_client = redis.Redis(
+        host=os.environ.get('REDIS_HOST', 'localhost'),
+        port=int(os.environ.get('REDIS_PORT', '6379')),
+        db=int(os.environ.get('REDIS_DB', '0'))
+    )
+    try:
+        redis_client.ping()
+    except redis.exceptions.ConnectionError:
+        print("⚠️ Redis unavailable, agent health and projects are kept in shared/")
+        redis_client = None
+    
     # Initialize health monitoring
-    health_monitor = create_health_endpoints(app)
+    health_monitor = create_health_endpoints(app, redis_client)
     
     # Initialize project management
-    project_manager = create_project_endpoints(app, socketio)
+    project_manager = create_project_endpoints(app, socketio, redis_client)
     
     print("🚀 A2A Interactive Dashboard Server")
     print(f"📱 Dashboard: http://localhost:{DASHBOARD_PORT}")
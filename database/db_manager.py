@@ -177,6 +177,23 @@ class DatabaseManager:
                 )
             conn.commit()
     
+    def log_requests_bulk(self, rows: List[tuple]):
+        """Log several API requests in one transaction
+        
+        Each row is (api_key_id, endpoint, method, ip_address, timestamp,
+        response_code, response_time_ms), with an ISO-format UTC timestamp.
+        """
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"""INSERT INTO request_logs 
+                (api_key_id, endpoint, method, ip_address, timestamp, response_code, response_time_ms) 
+                VALUES ({", ".join([placeholder] * 7)})""",
+                rows
+            )
+            conn.commit()
+    
     # Migration helper
     def migrate_from_json(self, json_file_path: str):
         """Migrate tasks from JSON file to database"""
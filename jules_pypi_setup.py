@@ -114,16 +114,18 @@ def setup_jules_environment():
         print(f"❌ Flask test error: {e}")
         return False
 
-    # Step 6: Create shared directory and tasks.json if needed
+    # Step 6: Create shared directory and tasks.jsonl if needed
     shared_dir = Path("shared")
     if not shared_dir.exists():
         shared_dir.mkdir()
         print("✅ Created shared directory")
 
-    tasks_file = shared_dir / "tasks.json"
-    if not tasks_file.exists():
-        tasks_file.write_text("[]")
-        print("✅ Created tasks.json file")
+    # A legacy tasks.json is converted by the server, but only while
+    # tasks.jsonl doesn't exist yet
+    tasks_file = shared_dir / "tasks.jsonl"
+    if not tasks_file.exists() and not (shared_dir / "tasks.json").exists():
+        tasks_file.write_text("")
+        print("✅ Created tasks.jsonl file")
 
     print("\n🎉 SETUP COMPLETE!")
     print("✅ Virtual environment ready")
@@ -18,7 +18,7 @@ class A2ABackup:
         
         # Files to backup
         self.backup_files = [
-            "shared/tasks.json",
+            "shared/tasks.jsonl",
             "shared/agent_tasks.json",
             "database/a2a_system.db",  # If using SQLite
         ]
@@ -282,7 +282,7 @@ class A2ADeployment:
         
         # Validate data persistence
         try:
-            tasks_file = Path("shared/tasks.json")
+            tasks_file = Path("shared/tasks.jsonl")
             validation_results["data_persistence"] = tasks_file.exists()
             
             if not tasks_file.exists():
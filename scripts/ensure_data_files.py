@@ -12,10 +12,12 @@ SHARED_DIR = BASE_DIR / "shared"
 # Ensure shared directory exists
 SHARED_DIR.mkdir(exist_ok=True)
 
-# Ensure tasks.json exists
-tasks_file = SHARED_DIR / "tasks.json"
-if not tasks_file.exists():
-    tasks_file.write_text("[]")
+# Ensure tasks.jsonl exists, unless a tasks.json from an older version is
+# still there: the server converts that one on startup, and only while
+# tasks.jsonl is missing
+tasks_file = SHARED_DIR / "tasks.jsonl"
+if not tasks_file.exists() and not (SHARED_DIR / "tasks.json").exists():
+    tasks_file.write_text("")
     print(f"Created {tasks_file}")
 
 # Ensure agent_tasks.json exists
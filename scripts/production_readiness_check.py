@@ -464,7 +464,7 @@ class ProductionReadinessCheck:
             issues.append("Backup and recovery procedures not documented")
         
         # Check data files can be backed up
-        data_files = ["shared/tasks.json"]
+        data_files = ["shared/tasks.jsonl"]
         backup["data_files_accessible"] = all(Path(f).exists() for f in data_files)
         
         if not backup["data_files_accessible"]:
@@ -0,0 +1,145 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agents import ai_connector
+
+
+class TestAIConnector(unittest.TestCase):
+    def test_create_pool_uses_unix_socket_when_configured(self):
+        with patch.object(ai_connector, "REDIS_UNIX_SOCKET", "/tmp/redis.sock"):
+            pool = ai_connector.create_pool()
+
+        self.assertIs(
+            pool.connection_class, ai_connector.redis.UnixDomainSocketConnection
+        )
+        self.assertEqual(pool.connection_kwargs["path"], "/tmp/redis.sock")
+
+    def test_process_task_echoes_task(self):
+        result = ai_connector.process_task({b"task": b"hello"})
+        self.assertEqual(result, {b"status": b"completed", b"result": b"hello"})
+
+    def test_flush_results_uses_single_pipeline(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        results = [("1-0", {"result": "a"}), ("2-0", {"result": "b"})]
+
+        ai_connector.flush_results(client, results)
+
+        client.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(pipe.xadd.call_count, 2)
+        pipe.xack.assert_called_once_with(
+            ai_connector.STREAM_NAME, ai_connector.GROUP_NAME, "1-0", "2-0"
+        )
+        pipe.execute.assert_called_once()
+        client.xack.assert_not_called()
+
+    def test_flush_results_skips_xack_in_noack_mode(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+
+        with patch.object(ai_connector, "USE_NOACK", True):
+            ai_connector.flush_results(client, [("1-0", {"result": "a"})])
+
+        pipe.xadd.assert_called_once_with(
+            ai_connector.RESULT_STREAM,
+            {"result": "a"},
+            maxlen=ai_connector.RESULT_STREAM_MAXLEN,
+            approximate=True,
+        )
+        pipe.xack.assert_not_called()
+
+    def test_flush_results_individually_skips_failures(self):
+        client = MagicMock()
+        client.xadd.side_effect = [ai_connector.redis.RedisError("boom"), "2-1"]
+        results = [("1-0", {"result": "a"}), ("2-0", {"result": "b"})]
+
+        stats = ai_connector.ConsumerStats()
+
+        flushed = ai_connector.flush_results_individually(client, results, stats)
+
+        self.assertEqual(flushed, 1)
+        self.assertEqual(stats.errors, 1)
+        client.xack.assert_called_once_with(
+            ai_connector.STREAM_NAME, ai_connector.GROUP_NAME, "2-0"
+        )
+
+    def test_reclaim_pending_pages_through_idle_messages(self):
+        client = MagicMock()
+        client.xautoclaim.side_effect = [
+            [b"5-0", [(b"1-0", {b"task": b"a"}), (b"2-0", None)]],
+            [b"0-0", [(b"6-0", {b"task": b"b"})], []],
+        ]
+
+        messages = ai_connector.reclaim_pending(client)
+
+        self.assertEqual(messages, [(b"1-0", {b"task": b"a"}), (b"6-0", {b"task": b"b"})])
+        self.assertEqual(
+            [call.kwargs["start_id"] for call in client.xautoclaim.call_args_list],
+            ["0-0", b"5-0"],
+        )
+        client.xautoclaim.assert_called_with(
+            ai_connector.STREAM_NAME,
+            ai_connector.GROUP_NAME,
+            ai_connector.CONSUMER_NAME,
+            ai_connector.PENDING_RECLAIM_IDLE_MS,
+            start_id=b"5-0",
+            count=ai_connector.BATCH_SIZE,
+        )
+
+    def test_health_response_has_matching_content_length(self):
+        response = ai_connector.build_health_response(ai_connector.start_time)
+        head, body = response.split(b"\r\n\r\n", 1)
+
+        self.assertTrue(head.startswith(b"HTTP/1.1 200 OK"))
+        self.assertIn(b"Content-Length: %d" % len(body), head)
+
+    def test_health_response_reads_published_stats(self):
+        stats = ai_connector.ConsumerStats(
+            tasks_processed=5, errors=1, redis_connected=True
+        )
+        ai_connector.publish_stats(stats)
+        ai_connector.publish_stats(ai_connector.ConsumerStats(), ai_connector.WRITER)
+
+        response = ai_connector.build_health_response(ai_connector.start_time)
+        body = json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+        self.assertEqual(body["status"], "healthy")
+        self.assertEqual(body["tasks_processed"], 5)
+        self.assertEqual(body["errors"], 1)
+
+    def test_write_batches_flushes_everything_queued(self):
+        client = MagicMock()
+        result_queue = ai_connector.queue.Queue()
+        result_queue.put((1.0, [("1-0", {"result": "a"})]))
+        result_queue.put((2.0, [("2-0", {"result": "b"}), ("3-0", {"result": "c"})]))
+        stats = ai_connector.ConsumerStats()
+
+        batches = ai_connector.drain_batches(result_queue)
+        ai_connector.write_batches(client, batches, stats)
+
+        client.pipeline.assert_called_once()
+        self.assertEqual(stats.tasks_processed, 3)
+        self.assertEqual(stats.last_task_time, 2.0)
+
+    def test_health_response_is_cached(self):
+        ai_connector._cached_health = (0.0, b"")
+        with patch.object(
+            ai_connector, "build_health_response", return_value=b"cached"
+        ) as build:
+            self.assertEqual(ai_connector.get_health_response(), b"cached")
+            self.assertEqual(ai_connector.get_health_response(), b"cached")
+        build.assert_called_once()
+        ai_connector._cached_health = (0.0, b"")
+
+    def test_backoff_delay_grows_and_is_capped(self):
+        with patch.object(ai_connector.random, "random", return_value=0.5):
+            self.assertAlmostEqual(ai_connector.backoff_delay(0), 0.1)
+            self.assertAlmostEqual(ai_connector.backoff_delay(3), 0.8)
+            self.assertEqual(
+                ai_connector.backoff_delay(20), ai_connector.RECONNECT_BACKOFF_MAX
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
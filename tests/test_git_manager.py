@@ -0,0 +1,100 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from agents.git_manager import GitManager
+
+
+def init_repo(path, subjects=()):
+    """git init path and commit one empty commit per subject"""
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="Ann Example", GIT_AUTHOR_EMAIL="ann@example.com",
+        GIT_COMMITTER_NAME="Ann Example", GIT_COMMITTER_EMAIL="ann@example.com",
+    )
+    subprocess.run(["git", "init", "-q", path], check=True)
+    for i, subject in enumerate(subjects):
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"{1704103200 + i * 86400} -0500"
+        subprocess.run(
+            ["git", "commit", "-q", "--allow-empty", "-m", subject],
+            cwd=path, env=env, check=True
+        )
+
+
+class TestGitManager(unittest.TestCase):
+    def test_parse_commit_matches_git_log_fields(self):
+        content = (
+            b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+            b"parent 3b1e58ed181de3ccf2da2d5c78f058b5cf71e632\n"
+            b"author Bob Q <bob@example.com> 1704169800 -0500\n"
+            b"committer Bob Q <bob@example.com> 1704103200 +0000\n"
+            b"\n"
+            b"first line\ncontinued subject\n\nbody para\n"
+        )
+
+        info = GitManager._parse_commit(content)
+
+        self.assertEqual(info["parents"], ["3b1e58ed181de3ccf2da2d5c78f058b5cf71e632"])
+        self.assertEqual(info["author"], "Bob Q")
+        # Author date is shown in the author's own timezone
+        self.assertEqual(info["date"], "2024-01-01")
+        self.assertEqual(info["subject"], "first line continued subject")
+        self.assertEqual(info["commit_time"], 1704103200)
+
+    def test_parse_commit_rejects_malformed_signature(self):
+        for author in (
+            b"author Bob Q <bob@example.com> 1704169800\n",
+            b"author Bob Q <bob@example.com> soon -0500\n",
+        ):
+            content = (
+                b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n" + author +
+                b"committer Bob Q <bob@example.com> 1704103200 +0000\n\nsubject\n"
+            )
+            self.assertIsNone(GitManager._parse_commit(content))
+
+    def test_parse_commit_decodes_declared_encoding(self):
+        content = (
+            b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+            b"author Jos\xe9 <jose@example.com> 1704103200 +0000\n"
+            b"committer Jos\xe9 <jose@example.com> 1704103200 +0000\n"
+            b"encoding ISO-8859-1\n"
+            b"\n"
+            b"caf\xe9\n"
+        )
+
+        info = GitManager._parse_commit(content)
+
+        self.assertEqual(info["author"], "Jos\u00e9")
+        self.assertEqual(info["subject"], "caf\u00e9")
+
+    def test_commit_walks_match_git_log(self):
+        with tempfile.TemporaryDirectory() as path:
+            init_repo(path, ["first", "second | with bar", "third\nfolded"])
+            manager = GitManager(path)
+            expected = self._git_log(manager)
+            self.assertEqual(len(expected), 3)
+
+            self.assertEqual(manager._walk_commit_log(5), expected)
+            with mock.patch.object(manager, "_repo", None):
+                self.assertEqual(manager._walk_commit_log(5), expected)
+            manager.close()
+
+    @staticmethod
+    def _git_log(manager):
+        with mock.patch.object(manager, "_walk_commit_log", return_value=None):
+            return manager.get_commit_log(5)
+
+    def test_for_path_reuses_live_instance(self):
+        with tempfile.TemporaryDirectory() as path:
+            init_repo(path)
+            first = GitManager.for_path(path)
+            again = GitManager.for_path(str(first.repo_path))
+
+            self.assertIs(first, again)
+            first.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
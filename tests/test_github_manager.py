@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from agents.github_manager import GitHubManager
+
+
+class TestGitHubManager(unittest.TestCase):
+    def test_not_modified_returns_cached_body(self):
+        github = GitHubManager(token="t")
+        first = MagicMock(status_code=200, headers={"ETag": '"abc"'}, content=b'[{"number": 1}]')
+        not_modified = MagicMock(status_code=304, headers={})
+
+        with patch.object(github, "_make_request", side_effect=[first, not_modified]) as request:
+            self.assertEqual(github.get_issues()["issues"], [{"number": 1}])
+            result = github.get_issues()
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["issues"], [{"number": 1}])
+        self.assertIsNone(request.call_args_list[0].kwargs["headers"])
+        self.assertEqual(request.call_args_list[1].kwargs["headers"], {"If-None-Match": '"abc"'})
+
+    def test_etag_cache_file_is_reused_by_next_instance(self):
+        cache_file = Path(tempfile.mkdtemp()) / "etags.json"
+        first = MagicMock(status_code=200, headers={"ETag": '"v1"'}, content=b'{"login": "me"}')
+        with patch.object(GitHubManager, "_make_request", return_value=first):
+            GitHubManager(token="t", etag_cache_file=cache_file).test_authentication()
+
+        github = GitHubManager(token="t", etag_cache_file=cache_file)
+        not_modified = MagicMock(status_code=304, headers={})
+        with patch.object(github, "_make_request", return_value=not_modified) as request:
+            result = github.test_authentication()
+
+        self.assertEqual(result["user"], "me")
+        self.assertEqual(request.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        # A different token starts with an empty cache
+        self.assertEqual(GitHubManager(token="u", etag_cache_file=cache_file)._etag_cache, {})
+
+    def test_etag_cache_file_is_private(self):
+        cache_file = Path(tempfile.mkdtemp()) / "a2a" / "etags.json"
+        first = MagicMock(status_code=200, headers={"ETag": '"v1"'}, content=b'{"login": "me"}')
+        with patch.object(GitHubManager, "_make_request", return_value=first):
+            GitHubManager(token="t", etag_cache_file=cache_file).test_authentication()
+
+        self.assertEqual(cache_file.parent.stat().st_mode & 0o777, 0o700)
+        self.assertEqual(cache_file.stat().st_mode & 0o777, 0o600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -137,7 +137,7 @@ class TestJulesAPI:
             assert task["created"].endswith("Z")
     
     def test_task_persistence(self):
-        """Test that tasks are persisted to shared/tasks.json"""
+        """Test that tasks are persisted to shared/tasks.jsonl"""
         # Add a unique task
         unique_task = f"Persistence test {time.time()}"
         requests.post(
@@ -153,11 +153,11 @@ class TestJulesAPI:
         assert task_found, f"Task '{unique_task}' not found in task list"
         
         # Verify task is in file
-        tasks_file = Path(__file__).parent.parent / "shared" / "tasks.json"
+        tasks_file = Path(__file__).parent.parent / "shared" / "tasks.jsonl"
         if tasks_file.exists():
-            file_tasks = json.loads(tasks_file.read_text())
+            file_tasks = [json.loads(line) for line in tasks_file.read_text().splitlines() if line.strip()]
             file_task_found = any(task["task"] == unique_task for task in file_tasks)
-            assert file_task_found, f"Task '{unique_task}' not found in tasks.json"
+            assert file_task_found, f"Task '{unique_task}' not found in tasks.jsonl"
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
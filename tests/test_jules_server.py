@@ -0,0 +1,261 @@
+import json
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+from api import jules_server
+
+
+def _append_tasks(count):
+    for i in range(count):
+        jules_server._append_task({"task": f"task {i}"}, assign_id=True)
+
+
+class TestTaskFile(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tasks_file = Path(tmp_dir.name) / "tasks.jsonl"
+        patcher = mock.patch.multiple(
+            jules_server, TASKS_FILE=self.tasks_file, _tasks_file_count=(0, 0)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @unittest.skipUnless(jules_server.FCNTL_AVAILABLE, "needs fcntl.flock")
+    def test_processes_appending_get_distinct_ids(self):
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_append_tasks, args=(50,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        ids = [json.loads(line)["id"] for line in self.tasks_file.read_text().splitlines()]
+        self.assertEqual(sorted(ids), list(range(1, 101)))
+
+    def test_migrates_legacy_tasks_json(self):
+        legacy_file = self.tasks_file.with_name("tasks.json")
+        legacy_file.write_text(json.dumps([{"id": 1, "task": "old"}, {"id": 2, "task": "older"}]))
+
+        with mock.patch.object(jules_server, "LEGACY_TASKS_FILE", legacy_file):
+            jules_server._migrate_tasks_file()
+
+        lines = self.tasks_file.read_text().splitlines()
+        self.assertEqual([json.loads(line)["task"] for line in lines], ["old", "older"])
+        self.assertEqual(jules_server._append_task({"task": "new"}, assign_id=True), 3)
+
+    def test_counts_tasks_appended_by_others(self):
+        self.assertEqual(jules_server._append_task({"task": "first"}, assign_id=True), 1)
+        with open(self.tasks_file, "ab") as f:
+            f.write(b'{"id":2,"task":"from another worker"}\n')
+
+        task = {"task": "third"}
+        self.assertEqual(jules_server._append_task(task, assign_id=True), 3)
+        self.assertEqual(task["id"], 3)
+
+
+class TestBulkPayloadValidation(unittest.TestCase):
+    def setUp(self):
+        self.client = jules_server.app.test_client()
+
+    def assertRejected(self, path, payload):
+        response = self.client.post(f"/agent/codex/tasks/{path}", json=payload)
+        self.assertEqual(response.status_code, 400, payload)
+        self.assertIn("error", response.get_json())
+
+    def test_complete_bulk_rejects_bad_results(self):
+        self.assertRejected("complete_bulk", {"results": [{"response": "x"}]})
+        self.assertRejected("complete_bulk", {"results": ["abc"]})
+        self.assertRejected("complete_bulk", {"results": [{"id": [1]}]})
+
+    def test_acknowledge_bulk_rejects_bad_ids(self):
+        self.assertRejected("acknowledge_bulk", {"ids": ["x"]})
+        self.assertRejected("acknowledge_bulk", {"ids": [None]})
+        self.assertRejected("acknowledge_bulk", {"ids": [True]})
+
+    def test_batch_rejects_bad_completions(self):
+        self.assertRejected("batch", {"completions": [{"id": "x"}]})
+        self.assertRejected("batch", {"completions": [3]})
+
+
+class TestListTasksArguments(unittest.TestCase):
+    def setUp(self):
+        self.client = jules_server.app.test_client()
+
+    def test_rejects_non_finite_since(self):
+        for since in ("nan", "inf", "-inf"):
+            response = self.client.get(f"/tasks?since={since}")
+            self.assertEqual(response.status_code, 400, since)
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis[lua]")
+class RedisTestCase(unittest.TestCase):
+    """Runs the app against an in-memory Redis, Lua scripts included"""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        # The scripts only exist if Redis was reachable at import
+        patcher = mock.patch.multiple(
+            jules_server,
+            create=True,
+            redis_client=self.redis,
+            pending_agent_tasks_script=self.redis.register_script(jules_server.PENDING_AGENT_TASKS_SCRIPT),
+            complete_agent_task_script=self.redis.register_script(jules_server.COMPLETE_AGENT_TASK_SCRIPT),
+            unassigned_tasks_script=self.redis.register_script(jules_server.UNASSIGNED_TASKS_SCRIPT),
+            index_unassigned_tasks_script=self.redis.register_script(
+                jules_server.INDEX_UNASSIGNED_TASKS_SCRIPT
+            ),
+            _redis_healthy=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        jules_server._list_cache.clear()
+        self.addCleanup(jules_server._list_cache.clear)
+        self.client = jules_server.app.test_client()
+
+
+class TestRedisErrors(RedisTestCase):
+    def test_command_error_keeps_redis_as_store(self):
+        self.redis.set("a2a:tasks_z", "not a sorted set")
+
+        with self.assertLogs(jules_server.app.logger, "ERROR"):
+            response = self.client.get("/tasks")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(jules_server._redis_healthy)
+
+    def test_connection_error_opens_breaker(self):
+        with mock.patch.object(
+            self.redis, "zrevrange", side_effect=jules_server.RedisConnectionError
+        ), self.assertLogs(jules_server.app.logger, "ERROR"):
+            response = self.client.get("/tasks")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(jules_server._redis_healthy)
+
+
+class TestRedisTasks(RedisTestCase):
+    def add_task(self, task, assigned_to=None):
+        payload = {"task": task}
+        if assigned_to:
+            payload["assigned_to"] = assigned_to
+        response = self.client.post("/add_task", json=payload)
+        self.assertEqual(response.status_code, 201)
+        return response.get_json()["task"]
+
+    def test_add_list_complete(self):
+        first = self.add_task("first", assigned_to="codex")
+        second = self.add_task("second", assigned_to="codex")
+        self.add_task("general")
+
+        pending = self.client.get("/agent/codex/tasks").get_json()
+        self.assertEqual([task["id"] for task in pending], [first["id"], second["id"]])
+
+        response = self.client.post(
+            f"/agent/codex/tasks/{first['id']}/complete", json={"response": "done"}
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            f"/agent/codex/tasks/{first['id']}/complete", json={"response": "again"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+        pending = self.client.get("/agent/codex/tasks").get_json()
+        self.assertEqual([task["id"] for task in pending], [second["id"]])
+        tasks = self.client.get("/tasks").get_json()
+        self.assertIn("[codex] done", [task["task"] for task in tasks])
+        completion = json.loads(self.redis.lindex("a2a:completed_tasks", 0))
+        self.assertEqual((completion["task_id"], completion["response"]), (first["id"], "done"))
+
+    def test_complete_bulk_reports_missing_tasks(self):
+        task = self.add_task("bulk", assigned_to="codex")
+
+        response = self.client.post("/agent/codex/tasks/batch", json={"completions": [
+            {"id": task["id"], "response": "ok"}, {"id": 999, "response": "lost"}
+        ]})
+
+        self.assertEqual(response.get_json(), {"completed": [task["id"]], "failed": [999]})
+        self.assertTrue(self.redis.hexists("a2a:task_acks", f"codex:{task['id']}"))
+        self.assertEqual(self.client.get("/agent/codex/tasks").get_json(), [])
+
+    def test_agent_tasks_etag(self):
+        self.add_task("tagged", assigned_to="codex")
+        response = self.client.get("/agent/codex/tasks")
+        etag = response.headers["ETag"]
+
+        response = self.client.get("/agent/codex/tasks", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.add_task("another", assigned_to="codex")
+        response = self.client.get("/agent/codex/tasks", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+
+    def test_writes_clear_list_cache(self):
+        self.assertEqual(self.client.get("/tasks").get_json(), [])
+        self.add_task("fresh")
+        self.assertEqual([task["task"] for task in self.client.get("/tasks").get_json()], ["fresh"])
+
+    def test_since_and_limit_paging(self):
+        for i in range(3):
+            with mock.patch.object(jules_server.time, "time", return_value=1000.0 + i):
+                self.add_task(f"task {i}")
+
+        def listed(query):
+            return [task["task"] for task in self.client.get(f"/tasks{query}").get_json()]
+
+        self.assertEqual(listed(""), ["task 2", "task 1", "task 0"])
+        self.assertEqual(listed("?limit=2"), ["task 2", "task 1"])
+        self.assertEqual(listed("?since=1001"), ["task 1", "task 2"])
+        self.assertEqual(listed("?since=0&limit=1"), ["task 0"])
+        self.assertEqual(listed("?limit=0"), [])
+
+    def test_wait_returns_pending_tasks(self):
+        self.add_task("waiting", assigned_to="codex")
+        response = self.client.get("/agent/codex/tasks/wait?timeout=5")
+        self.assertEqual([task["task"] for task in response.get_json()], ["waiting"])
+
+    def test_wait_times_out(self):
+        response = self.client.get("/agent/codex/tasks/wait?timeout=0")
+        self.assertEqual(response.get_json(), [])
+
+        self.add_task("seen", assigned_to="codex")
+        etag = self.client.get("/agent/codex/tasks").headers["ETag"]
+        with mock.patch.object(jules_server, "LONG_POLL_INTERVAL", 0.01):
+            response = self.client.get(
+                "/agent/codex/tasks/wait?timeout=0.05", headers={"If-None-Match": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_unassigned_tasks(self):
+        open_id = self.client.post("/tasks", json={"task": "open"}).get_json()["task_id"]
+        taken_id = self.client.post("/tasks", json={"task": "taken"}).get_json()["task_id"]
+        self.client.put(f"/tasks/{taken_id}", json={"assigned_to": "codex"})
+        self.client.post("/tasks", json={"task": "direct", "assigned_to": "jules"})
+
+        unassigned = self.client.get("/tasks/unassigned").get_json()
+
+        self.assertEqual(unassigned, [{"task_id": open_id, "data": {"task": "open"}}])
+
+    def test_indexes_unassigned_tasks_once(self):
+        self.redis.hset("task:old", mapping={"task": "old"})
+        self.redis.hset("task:mine", mapping={"task": "mine", "assigned_to": "codex"})
+
+        jules_server._index_unassigned_tasks()
+        self.assertEqual(self.redis.smembers("a2a:unassigned_tasks"), {"old"})
+
+        self.redis.hset("task:later", mapping={"task": "later"})
+        jules_server._index_unassigned_tasks()
+        self.assertEqual(self.redis.smembers("a2a:unassigned_tasks"), {"old"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from agents.task_router import KeywordRouter
+
+
+class TestKeywordRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = KeywordRouter([
+            ("github", [("test github", "github access")]),
+            ("dashboard", [("dashboard",), ("customer", "management")]),
+            ("test", [("test",)]),
+        ])
+
+    def test_routes_in_priority_order(self):
+        self.assertEqual(self.router.route("please test github now"), "github")
+        self.assertEqual(self.router.route("run a test"), "test")
+
+    def test_requires_every_keyword_group(self):
+        self.assertIsNone(self.router.route("build a dashboard"))
+        self.assertEqual(self.router.route("customer dashboard"), "dashboard")
+
+    def test_matches_overlapping_keywords(self):
+        self.assertEqual(
+            self.router.matches("test github access"),
+            {"test github", "test", "github access"},
+        )
+
+    def test_matches_keyword_prefix_at_same_position(self):
+        self.assertEqual(self.router.matches("test github"), {"test github", "test"})
+        router = KeywordRouter([("a", [("test github",), ("x",)]), ("t", [("test",), ("github",)])])
+        self.assertEqual(router.route("test github"), "t")
+
+    def test_no_match(self):
+        self.assertIsNone(self.router.route("hello"))
+
+
+if __name__ == '__main__':
+    unittest.main()